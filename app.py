@@ -2,29 +2,14 @@
 import streamlit as st
 from docx import Document
 import logic
-import indo_umum.cover as indo_cover
-import indo_umum.isi as indo_isi
-import indo_umum.ppt as indo_ppt
-import indo_umum.ppt_stream as indo_ppt_stream
-
-import batak_umum.cover as batak_cover
-import batak_umum.isi as batak_isi
-import batak_umum.ppt as batak_ppt
-import batak_umum.ppt_stream as batak_ppt_stream
-
-import remaja.cover as remaja_cover
-import remaja.isi as remaja_isi
-import remaja.ppt as remaja_ppt
-import sore.cover as sore_cover
-import sore.isi as sore_isi
-import sore.ppt as sore_ppt
-import skm.cover as skm_cover
-import skm.isi as skm_isi
-import skm.ppt as skm_ppt
-from doc_converter import ensure_docx_bytes
-
-import requests
-import os
+import liturgy_registry
+import deck_cache
+import instrumentation
+from doc_converter import ensure_docx_bytes, is_doc_file, queue_status
+from disk_cache import sha256_hex
+from doc_analysis import analyze
+
+import audit_log
 from datetime import datetime
 from dotenv import load_dotenv
 
@@ -39,6 +24,12 @@ if "last_tata_name" not in st.session_state:
     st.session_state.last_tata_name = None
 if "last_warta_name" not in st.session_state:
     st.session_state.last_warta_name = None
+if "tata_hash" not in st.session_state:
+    st.session_state.tata_hash = None
+if "warta_hash" not in st.session_state:
+    st.session_state.warta_hash = None
+if "traces" not in st.session_state:
+    st.session_state.traces = []
 
 st.markdown("""
     <style>
@@ -114,16 +105,12 @@ load_dotenv()
 
 
 def send_telegram_log(file_name, format_type, mode="-", bg="-", status="SUCCESS", note=""):
-    token = os.getenv("TELEGRAM_TOKEN")
-    chat_id = os.getenv("TELEGRAM_CHAT_ID")
-    if not token or not chat_id:
+    # Pengiriman dilakukan thread audit_log di latar belakang,
+    # di sini hanya menyusun record lalu memasukkannya ke antrian.
+    audit_logger = audit_log.get_logger()
+    if audit_logger is None:
         return
 
-    try:
-        client_ip = requests.get('https://api.ipify.org', timeout=3).text
-    except:
-        client_ip = "Unknown"
-
     try:
         ua = st.context.headers.get("User-Agent", "")
         # Deteksi Device
@@ -152,29 +139,73 @@ def send_telegram_log(file_name, format_type, mode="-", bg="-", status="SUCCESS"
     except:
         device, browser = "Hidden", "Hidden"
 
-    url = f"https://api.telegram.org/bot{token.strip()}/sendMessage"
-
-    pesan = (
-        f" *SLIDENAULI LOG *\n\n"
-        f" *File:* `{file_name}`\n"
-        f" *Format:* {format_type}\n"
-        f" *Mode:* {mode} | *BG:* {bg}\n"
-        f" *IP:* `{client_ip}`\n"
-        f" *Device:* {device}\n"
-        f" *Browser:* {browser}\n"
-        f" *Audit:* `{note}`\n"
-        f" *Waktu:* {datetime.now().strftime('%d/%m/%Y %H:%M:%S')}"
-    )
-
-    try:
-        requests.post(url, data={
-                      "chat_id": chat_id, "text": pesan, "parse_mode": "Markdown"}, timeout=5)
-    except:
-        pass
-
-
-def get_document(file_bytes):
-    return Document(logic.BytesIO(file_bytes))
+    audit_logger.log({
+        "file_name": file_name,
+        "format_type": format_type,
+        "mode": mode,
+        "bg": bg,
+        "device": device,
+        "browser": browser,
+        "note": note,
+        "waktu": datetime.now().strftime('%d/%m/%Y %H:%M:%S'),
+    })
+
+
+# Hasil parsing di-cache berdasarkan hash isi file (parameter berawalan "_"
+# tidak ikut di-hash Streamlit), jadi rerun karena widget tidak mem-parsing ulang.
+@st.cache_resource(max_entries=8)
+def get_document(doc_hash, _file_bytes):
+    return Document(logic.BytesIO(_file_bytes))
+
+
+# Teks paragraf dihitung sekali per file lalu dipakai deteksi format,
+# ekstraksi cover dan ekstraksi isi. Dibaca langsung dari bytes, jadi
+# Document lengkap hanya dibangun untuk warta yang disalin ke slide.
+@st.cache_resource(max_entries=8)
+def get_analysis(doc_hash, _file_bytes):
+    return analyze(_file_bytes)
+
+
+def remember_trace(t):
+    # Hanya trace terakhir sesi ini yang disimpan untuk panel debug
+    traces = st.session_state.traces + [t.as_dict()]
+    st.session_state.traces = traces[-instrumentation.RECENT_TRACES:]
+
+
+# Hanya paragraf awal yang dibaca, jadi hasil deteksi langsung muncul
+# walaupun file warta berukuran besar. Isi fungsi cache_data hanya jalan
+# saat cache miss, jadi trace-nya hanya tercatat jika benar-benar dihitung.
+@st.cache_data(max_entries=32)
+def get_format(doc_hash, _file_bytes):
+    with instrumentation.trace("detect") as t:
+        result = logic.detect_format_bytes(_file_bytes)
+    remember_trace(t)
+    return result
+
+
+@st.cache_data(max_entries=32)
+def get_extracted(doc_hash, _file_bytes, fmt):
+    m_cover = liturgy_registry.load(fmt, "cover")
+    m_isi = liturgy_registry.load(fmt, "isi")
+    with instrumentation.trace("extract", format=fmt) as t:
+        with instrumentation.span("analyze"):
+            analysis = get_analysis(doc_hash, _file_bytes)
+        with instrumentation.span("extract_cover"):
+            data_cover = m_cover.extract_cover(analysis)
+        with instrumentation.span("extract_isi"):
+            data_isi = m_isi.extract_isi(analysis)
+    remember_trace(t)
+    return data_cover, data_isi
+
+
+def show_queue_status(filename):
+    if not is_doc_file(filename):
+        return
+    status = queue_status()
+    if status["waiting"] or status["busy"] >= status["workers"]:
+        st.info(
+            f"⏳ Antrian konversi: {status['waiting']} file menunggu, "
+            f"{status['busy']}/{status['workers']} worker sibuk.")
 
 
 st.markdown('<h2 class="section-title">1. Dokumen</h2>',
@@ -195,58 +226,70 @@ with col2:
 
 if uploaded_tata:
     if uploaded_tata.name != st.session_state.last_tata_name:
+        show_queue_status(uploaded_tata.name)
         with st.spinner("Memproses file Tata Ibadah..."):
             try:
-                tata_bytes, _ = ensure_docx_bytes(
-                    uploaded_tata.getvalue(), uploaded_tata.name)
+                with instrumentation.trace("upload", kind="tata") as t:
+                    tata_bytes, _ = ensure_docx_bytes(
+                        uploaded_tata.getvalue(), uploaded_tata.name)
+                remember_trace(t)
                 st.session_state.tata_bytes = tata_bytes
                 st.session_state.last_tata_name = uploaded_tata.name
+                st.session_state.tata_hash = sha256_hex(tata_bytes)
             except RuntimeError as e:
                 st.error(f"❌ Gagal memproses file Tata Ibadah: {e}")
                 st.session_state.tata_bytes = None
                 st.session_state.last_tata_name = None
+                st.session_state.tata_hash = None
 else:
     st.session_state.tata_bytes = None
     st.session_state.last_tata_name = None
+    st.session_state.tata_hash = None
 
 if uploaded_warta:
     if uploaded_warta.name != st.session_state.last_warta_name:
+        show_queue_status(uploaded_warta.name)
         with st.spinner("Memproses file Warta..."):
             try:
-                warta_bytes, _ = ensure_docx_bytes(
-                    uploaded_warta.getvalue(), uploaded_warta.name)
+                with instrumentation.trace("upload", kind="warta") as t:
+                    warta_bytes, _ = ensure_docx_bytes(
+                        uploaded_warta.getvalue(), uploaded_warta.name)
+                remember_trace(t)
                 st.session_state.warta_bytes = warta_bytes
                 st.session_state.last_warta_name = uploaded_warta.name
+                st.session_state.warta_hash = sha256_hex(warta_bytes)
             except RuntimeError as e:
                 st.error(f"❌ Gagal memproses file Warta: {e}")
                 st.session_state.warta_bytes = None
                 st.session_state.last_warta_name = None
+                st.session_state.warta_hash = None
 else:
     st.session_state.warta_bytes = None
     st.session_state.last_warta_name = None
+    st.session_state.warta_hash = None
 
 det_tata = "Unknown"
 det_warta = "None"
 w_mode_final = "Normal"
 
 if st.session_state.tata_bytes:
-    doc_tata_check = get_document(st.session_state.tata_bytes)
-    det_tata = logic.detect_format(doc_tata_check)
+    det_tata, conf_tata = get_format(st.session_state.tata_hash,
+                                     st.session_state.tata_bytes)
     if "Warta" in det_tata:
         st.error(f"❌ Terdeteksi {det_tata}. Mohon upload di kolom Warta.")
     elif det_tata == "Sekolah Minggu (SKM)":
         st.warning(
             f"⚠️ Terdeteksi: {det_tata}. Fitur ini masih dalam pengembangan.")
     else:
-        st.success(f"✅ Terdeteksi: {det_tata}")
+        st.success(f"✅ Terdeteksi: {det_tata} (keyakinan {conf_tata:.0%})")
 
 if st.session_state.warta_bytes:
-    doc_warta_check = get_document(st.session_state.warta_bytes)
-    det_warta = logic.detect_format(doc_warta_check)
+    det_warta, conf_warta = get_format(st.session_state.warta_hash,
+                                       st.session_state.warta_bytes)
     if "Warta" not in det_warta:
         st.error(f"❌ Terdeteksi {det_warta}. Ini bukan file Warta.")
     else:
-        st.success(f"✅ Terdeteksi: {det_warta}")
+        st.success(f"✅ Terdeteksi: {det_warta} (keyakinan {conf_warta:.0%})")
 
 if st.session_state.tata_bytes and st.session_state.warta_bytes:
     if det_tata == "Ibadah Remaja":
@@ -262,27 +305,18 @@ if st.session_state.tata_bytes and st.session_state.warta_bytes:
                 "❌ Warta Remaja seharusnya digunakan untuk Tata Ibadah Remaja.")
         w_mode_final = "Normal"
 if st.session_state.tata_bytes:
-    doc_tata = get_document(st.session_state.tata_bytes)
     st.markdown('<h2 class="section-title">2. Pengaturan</h2>',
                 unsafe_allow_html=True)
 
     c_set1, c_set2 = st.columns(2)
-    options = ["Ibadah Indonesia Umum", "Ibadah Batak Umum",
-               "Ibadah Remaja", "Ibadah Sore", "Sekolah Minggu (SKM)"]
-    mapping = {
-        "Sekolah Minggu (SKM)": (skm_cover, skm_isi, skm_ppt),
-        "Ibadah Sore": (sore_cover, sore_isi, sore_ppt),
-        "Ibadah Remaja": (remaja_cover, remaja_isi, remaja_ppt),
-        "Ibadah Batak Umum": (batak_cover, batak_isi, batak_ppt),
-        "Ibadah Indonesia Umum": (indo_cover, indo_isi, indo_ppt)
-    }
+    options = liturgy_registry.formats()
 
     with c_set1:
         selected_fmt = st.selectbox("Format", options, index=options.index(
             det_tata) if det_tata in options else 0)
 
     with c_set2:
-        if selected_fmt in ["Ibadah Indonesia Umum", "Ibadah Batak Umum"]:
+        if liturgy_registry.has_entry_point(selected_fmt, "ppt_stream"):
             selected_mode = st.selectbox(
                 "Mode Tampilan", ["Projector", "YouTube"], key="mode_tampilan_key")
         else:
@@ -290,13 +324,18 @@ if st.session_state.tata_bytes:
 
         use_bg = st.selectbox("Gunakan Background", [
                               "Ya", "Tidak"], index=1, key="global_bg_key")
+        # "layout": satu background untuk semua slide, file lebih kecil
+        bg_modes = {"Acak per acara": "shared", "Satu untuk semua slide": "layout"}
+        bg_mode = "shared"
+        if use_bg == "Ya":
+            bg_mode = bg_modes[st.selectbox(
+                "Jenis Background", list(bg_modes), key="bg_mode_key")]
 
-    m_cover, m_isi, m_ppt = mapping[selected_fmt]
-    data_cover = m_cover.extract_cover(doc_tata)
-    data_isi = m_isi.extract_isi(doc_tata)
+    data_cover, data_isi = get_extracted(
+        st.session_state.tata_hash, st.session_state.tata_bytes, selected_fmt)
 
     final_warta_doc = get_document(
-        st.session_state.warta_bytes) if st.session_state.warta_bytes else None
+        st.session_state.warta_hash, st.session_state.warta_bytes) if st.session_state.warta_bytes else None
 
     st.markdown("---")
 
@@ -306,32 +345,52 @@ if st.session_state.tata_bytes:
     else:
         if st.button("🚀 Proses Dokumen"):
             with st.spinner("Sedang meracik slide..."):
-                if selected_mode == "YouTube":
-                    m_ppt_module = batak_ppt_stream if selected_fmt == "Ibadah Batak Umum" else indo_ppt_stream
-                else:
-                    m_ppt_module = m_ppt
+                m_ppt_module = liturgy_registry.load(
+                    selected_fmt, "ppt_stream" if selected_mode == "YouTube" else "ppt")
 
                 c_info = {
                     "minggu": data_cover.get('minggu', ''),
                     "topik": data_cover.get('topik', ''),
                     "tanggal": data_cover.get('tanggal', ''),
                     "use_bg": True if use_bg == "Ya" else False,
+                    "bg_mode": bg_mode,
                     "mode": selected_mode
                 }
 
-                final_ppt = logic.merge_and_generate(
-                    final_warta_doc,
-                    c_info,
-                    data_isi,
-                    m_ppt_module.generate_slides,
-                    w_mode_final
-                )
+                # Deck yang sama (dokumen + pengaturan) langsung diambil dari
+                # cache. Seed background tetap logic.deck_seed (isi dokumen
+                # saja), sama seperti CLI, bukan kunci cache ini
+                deck_key = deck_cache.deck_key(
+                    st.session_state.tata_hash, st.session_state.warta_hash,
+                    selected_fmt, selected_mode, c_info["use_bg"], w_mode_final,
+                    bg_mode
+                ) if deck_cache.DECK_CACHE else None
+                final_ppt = deck_cache.get(deck_key) if deck_key else None
+                from_cache = final_ppt is not None
+
+                if final_ppt is None:
+                    with instrumentation.trace(
+                            "generate", format=selected_fmt, mode=selected_mode,
+                            use_bg=c_info["use_bg"],
+                            warta=w_mode_final if final_warta_doc else None) as t:
+                        final_ppt = logic.merge_and_generate(
+                            final_warta_doc,
+                            c_info,
+                            data_isi,
+                            m_ppt_module.generate_slides,
+                            w_mode_final
+                        ).getvalue()
+                    remember_trace(t)
+                    if deck_key:
+                        deck_cache.put(deck_key, final_ppt)
 
                 file_name = f"ppt_{selected_fmt}_{data_cover.get('tanggal', 'slide')}.pptx".replace(
                     " ", "_")
 
                 # KIRIM LOG DI SINI (Tepat setelah file siap, sebelum download)
                 audit_info = f"Tata: {det_tata} | Warta: {det_warta}"
+                if from_cache:
+                    audit_info += " | cache"
                 send_telegram_log(
                     file_name,
                     selected_fmt,
@@ -358,3 +417,25 @@ if 'data_cover' in locals() and data_cover:
     """, unsafe_allow_html=True)
 else:
     st.info("")
+
+
+# Panel debug (SLIDENAULI_DEBUG=1): waktu per tahap untuk sesi ini dan
+# total seluruh proses, plus waktu import modul liturgi
+if instrumentation.DEBUG_PANEL:
+    with st.expander("🔧 Debug: waktu per tahap"):
+        traces = st.session_state.traces
+        if traces:
+            last = traces[-1]
+            st.caption(f"Terakhir: {last['trace']} {last['time']} "
+                       f"({last['seconds'] * 1000:.0f} ms) {last['counters']}")
+            st.code(instrumentation.format_stages(last["stages"]))
+        stages, counters = instrumentation.totals()
+        st.caption(f"Total proses: {counters}")
+        st.code(instrumentation.format_stages(stages))
+        st.code(liturgy_registry.format_import_report())
+        if traces:
+            st.download_button(
+                "Download trace (JSONL)",
+                data=instrumentation.to_jsonl(traces),
+                file_name="slidenauli_trace.jsonl",
+                mime="application/x-ndjson")
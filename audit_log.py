@@ -0,0 +1,178 @@
+# audit_log.py
+import atexit
+import os
+import queue
+import threading
+import time
+
+import requests
+
+# Alamat API bisa diganti (misal ke server stub lokal saat pengujian)
+TELEGRAM_API_BASE = os.getenv("TELEGRAM_API_BASE", "https://api.telegram.org")
+IP_LOOKUP_URL = os.getenv("SLIDENAULI_IP_LOOKUP_URL", "https://api.ipify.org")
+
+# Batas panjang satu pesan Telegram
+TELEGRAM_MAX_CHARS = 4096
+
+
+def format_message(record, client_ip):
+    return (
+        f" *SLIDENAULI LOG *\n\n"
+        f" *File:* `{record['file_name']}`\n"
+        f" *Format:* {record['format_type']}\n"
+        f" *Mode:* {record['mode']} | *BG:* {record['bg']}\n"
+        f" *IP:* `{client_ip}`\n"
+        f" *Device:* {record['device']}\n"
+        f" *Browser:* {record['browser']}\n"
+        f" *Audit:* `{record['note']}`\n"
+        f" *Waktu:* {record['waktu']}"
+    )
+
+
+class AuditLogger:
+    """
+    Pengirim log audit ke Telegram yang berjalan di thread latar belakang.
+
+    `log()` hanya memasukkan record ke antrian terbatas lalu langsung
+    kembali; jika antrian penuh, record dibuang (dihitung di `dropped`).
+    Worker mengumpulkan beberapa record menjadi satu pesan, lalu
+    mengirimnya dengan retry dan backoff.
+    """
+
+    def __init__(self, token, chat_id, api_base=None, ip_url=None,
+                 max_queue=100, batch_size=10, batch_wait=2.0,
+                 retries=3, backoff=1.0, timeout=5):
+        self.url = f"{(api_base or TELEGRAM_API_BASE).rstrip('/')}/bot{token.strip()}/sendMessage"
+        self.chat_id = chat_id
+        self.ip_url = ip_url or IP_LOOKUP_URL
+        self.batch_size = batch_size
+        self.batch_wait = batch_wait
+        self.retries = retries
+        self.backoff = backoff
+        self.timeout = timeout
+
+        self.queue = queue.Queue(maxsize=max_queue)
+        self.client_ip = None
+        self.dropped = 0
+        self.sent = 0
+        self.failed = 0
+
+        self.thread = threading.Thread(
+            target=self._run, name="audit-log", daemon=True)
+        self.thread.start()
+
+    def log(self, record):
+        try:
+            self.queue.put_nowait(record)
+            return True
+        except queue.Full:
+            self.dropped += 1
+            return False
+
+    def flush(self, timeout=None):
+        """Tunggu sampai semua record di antrian selesai diproses."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while self.queue.unfinished_tasks:
+            if deadline is not None and time.monotonic() > deadline:
+                return False
+            time.sleep(0.05)
+        return True
+
+    def _lookup_ip(self):
+        if self.client_ip is None:
+            try:
+                self.client_ip = requests.get(self.ip_url, timeout=3).text
+            except requests.RequestException:
+                return "Unknown"
+        return self.client_ip
+
+    def _next_batch(self):
+        batch = [self.queue.get()]
+        deadline = time.monotonic() + self.batch_wait
+        while len(batch) < self.batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self.queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _post(self, text):
+        for attempt in range(self.retries + 1):
+            try:
+                resp = requests.post(self.url, data={
+                    "chat_id": self.chat_id, "text": text, "parse_mode": "Markdown"},
+                    timeout=self.timeout)
+                if resp.status_code < 400:
+                    return True
+                if resp.status_code < 500 and resp.status_code != 429:
+                    return False
+                delay = self.backoff * (2 ** attempt)
+                if resp.status_code == 429:
+                    try:
+                        delay = max(delay, resp.json()["parameters"]["retry_after"])
+                    except (ValueError, KeyError, TypeError):
+                        pass
+            except requests.RequestException:
+                delay = self.backoff * (2 ** attempt)
+            if attempt < self.retries:
+                time.sleep(delay)
+        return False
+
+    def _send(self, batch):
+        client_ip = self._lookup_ip()
+        chunks = []
+        current = ""
+        for record in batch:
+            text = format_message(record, client_ip)
+            if current and len(current) + 2 + len(text) > TELEGRAM_MAX_CHARS:
+                chunks.append(current)
+                current = text
+            else:
+                current = f"{current}\n\n{text}" if current else text
+        if current:
+            chunks.append(current)
+
+        for text in chunks:
+            if self._post(text):
+                self.sent += 1
+            else:
+                self.failed += 1
+
+    def _run(self):
+        while True:
+            batch = self._next_batch()
+            try:
+                self._send(batch)
+            except Exception:
+                self.failed += 1
+            finally:
+                for _ in batch:
+                    self.queue.task_done()
+
+
+_logger = None
+_logger_lock = threading.Lock()
+
+
+def get_logger():
+    """Logger bersama untuk proses ini, atau None jika token Telegram tidak diatur."""
+    global _logger
+    token = os.getenv("TELEGRAM_TOKEN")
+    chat_id = os.getenv("TELEGRAM_CHAT_ID")
+    if not token or not chat_id:
+        return None
+    with _logger_lock:
+        if _logger is None:
+            _logger = AuditLogger(token, chat_id)
+        return _logger
+
+
+def _flush_on_exit():
+    if _logger is not None:
+        _logger.flush(timeout=5)
+
+
+atexit.register(_flush_on_exit)
@@ -0,0 +1,212 @@
+# backgrounds.py
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from io import BytesIO
+
+from PIL import Image, ImageEnhance
+
+from disk_cache import DiskCache, sha256_hex
+
+BG_FOLDER = os.path.join(os.path.dirname(os.path.abspath(__file__)), "pics")
+BG_EXTENSIONS = ('.png', '.jpg', '.jpeg')
+
+# Resolusi maksimum background per rasio slide (gambar direntangkan
+# selebar slide, jadi piksel di atas ini tidak pernah terlihat)
+TARGET_SIZES = {
+    "4:3": (1440, 1080),
+    "16:9": (1920, 1080),
+}
+JPEG_QUALITY = int(os.getenv("SLIDENAULI_BG_QUALITY", "80"))
+# Sama dengan overlay hitam alpha 30% di logic.apply_background
+OVERLAY_ALPHA = 0.3
+
+_bg_cache = DiskCache("backgrounds", int(
+    float(os.getenv("SLIDENAULI_BG_CACHE_MB", "200")) * 1024 * 1024))
+
+
+def aspect_key(slide_width, slide_height):
+    return "16:9" if slide_width / slide_height > 1.5 else "4:3"
+
+
+def list_backgrounds(folder=BG_FOLDER):
+    if not os.path.exists(folder):
+        return []
+    return [os.path.join(folder, f) for f in sorted(os.listdir(folder))
+            if f.lower().endswith(BG_EXTENSIONS)]
+
+
+def _render(src_path, aspect, bake_overlay):
+    target_w, target_h = TARGET_SIZES[aspect]
+    with Image.open(src_path) as img:
+        img = img.convert("RGB")
+        w, h = img.size
+        size = (min(w, target_w), min(h, target_h))
+        if size != (w, h):
+            img = img.resize(size, Image.LANCZOS)
+
+    if bake_overlay:
+        # Lapisan hitam 30% = kecerahan dikali 0.7
+        img = ImageEnhance.Brightness(img).enhance(1 - OVERLAY_ALPHA)
+
+    buf = BytesIO()
+    img.save(buf, "JPEG", quality=JPEG_QUALITY, optimize=True)
+    return buf.getvalue()
+
+
+def prepare_background(src_path, aspect="4:3", bake_overlay=True):
+    """
+    Versi background yang sudah diperkecil ke resolusi slide dan
+    dikompres ulang sebagai JPEG, opsional dengan overlay gelap yang
+    sudah "dibakar" ke gambar.
+
+    Hasil disimpan di cache disk dengan kunci path, mtime, ukuran file
+    dan parameter render, sehingga tiap gambar hanya diproses sekali.
+
+    Returns:
+        bytes JPEG
+    """
+    st = os.stat(src_path)
+    key = sha256_hex(
+        f"{os.path.abspath(src_path)}|{st.st_mtime_ns}|{st.st_size}|"
+        f"{aspect}|{bake_overlay}|{JPEG_QUALITY}".encode())
+
+    data = _bg_cache.get(key)
+    if data is None:
+        data = _render(src_path, aspect, bake_overlay)
+        _bg_cache.put(key, data)
+    return data
+
+
+def build_background_cache(folder=BG_FOLDER, bake_overlay=True):
+    """Proses semua background di `folder` untuk setiap rasio slide."""
+    total_src = 0
+    total_out = 0
+    for path in list_backgrounds(folder):
+        total_src += os.path.getsize(path)
+        for aspect in TARGET_SIZES:
+            total_out += len(prepare_background(path, aspect, bake_overlay))
+    return total_src, total_out
+
+
+class BackgroundImage:
+    """Background siap pakai yang disimpan di memori."""
+
+    __slots__ = ("path", "blob", "sha1", "size")
+
+    def __init__(self, path, blob):
+        self.path = path
+        self.blob = blob
+        self.sha1 = hashlib.sha1(blob).hexdigest()
+        with Image.open(BytesIO(blob)) as img:
+            self.size = img.size
+
+
+class BackgroundRegistry:
+    """
+    Daftar background untuk seluruh proses.
+
+    Folder hanya di-scan ulang jika mtime folder atau salah satu file
+    berubah, dan gambar yang sudah disiapkan disimpan di memori (LRU,
+    dibatasi `max_bytes`), sehingga pemakaian background per slide cukup
+    berupa lookup dictionary tanpa baca file.
+    """
+
+    def __init__(self, folder=BG_FOLDER, max_bytes=64 * 1024 * 1024):
+        self.folder = folder
+        self.max_bytes = max_bytes
+        self.lock = threading.Lock()
+        self._dir_mtime = None
+        self._mtimes = {}
+        # File di luar folder (bg_map eksplisit); tidak ikut `files()`
+        self._external = {}
+        self._images = OrderedDict()
+        self._bytes = 0
+
+    def _scan(self):
+        try:
+            dir_mtime = os.stat(self.folder).st_mtime_ns
+        except OSError:
+            self._dir_mtime = None
+            self._mtimes = {}
+            return
+
+        # Daftar file hanya dibaca ulang jika isi folder berubah;
+        # perubahan isi file dideteksi dari mtime masing-masing file.
+        if dir_mtime != self._dir_mtime:
+            paths = list_backgrounds(self.folder)
+        else:
+            paths = list(self._mtimes)
+
+        mtimes = {}
+        for path in paths:
+            try:
+                mtimes[path] = os.stat(path).st_mtime_ns
+            except OSError:
+                pass
+
+        # Buang gambar yang filenya berubah atau sudah dihapus
+        for key in list(self._images):
+            if mtimes.get(key[0]) != self._mtimes.get(key[0]):
+                self._bytes -= len(self._images.pop(key).blob)
+
+        self._dir_mtime = dir_mtime
+        self._mtimes = mtimes
+
+    def files(self):
+        """Path semua background yang tersedia (scan ulang jika ada perubahan)."""
+        with self.lock:
+            self._scan()
+            return list(self._mtimes)
+
+    def get(self, path, aspect="4:3", bake_overlay=True):
+        """BackgroundImage untuk `path`, atau None jika tidak ada."""
+        key = (path, aspect, bake_overlay)
+        with self.lock:
+            if self._dir_mtime is None:
+                self._scan()
+            external = path not in self._mtimes
+            if not external:
+                image = self._images.get(key)
+                if image is not None:
+                    self._images.move_to_end(key)
+                    return image
+
+        if external:
+            # Path dari bg_map di luar folder: dicatat terpisah supaya tidak
+            # ikut menjadi kandidat background acak
+            try:
+                mtime = os.stat(path).st_mtime_ns
+            except OSError:
+                return None
+            with self.lock:
+                if self._external.get(path) != mtime:
+                    for old_key in [k for k in self._images if k[0] == path]:
+                        self._bytes -= len(self._images.pop(old_key).blob)
+                    self._external[path] = mtime
+                image = self._images.get(key)
+                if image is not None:
+                    self._images.move_to_end(key)
+                    return image
+
+        image = BackgroundImage(
+            path, prepare_background(path, aspect, bake_overlay))
+
+        with self.lock:
+            if key not in self._images:
+                self._images[key] = image
+                self._bytes += len(image.blob)
+                while self._bytes > self.max_bytes and len(self._images) > 1:
+                    _, old = self._images.popitem(last=False)
+                    self._bytes -= len(old.blob)
+            return self._images[key]
+
+
+registry = BackgroundRegistry()
+
+
+if __name__ == "__main__":
+    src, out = build_background_cache()
+    n_aspect = len(TARGET_SIZES)
+    print(f"Sumber: {src / 1e6:.1f} MB, cache ({n_aspect} rasio): {out / 1e6:.1f} MB")
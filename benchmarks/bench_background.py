@@ -0,0 +1,71 @@
+# benchmarks/bench_background.py
+#
+# Bandingkan mode background "slide" (add_picture per slide) dengan
+# "shared" (satu image part per deck) untuk deck 150 slide.
+#
+#   python benchmarks/bench_background.py [--slides 150] [--repeat 3]
+
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+from io import BytesIO
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pptx import Presentation  # noqa: E402
+
+import backgrounds  # noqa: E402
+import logic  # noqa: E402
+
+
+def build_deck(n_slides, bg_paths, mode):
+    prs = Presentation()
+    image_parts = {} if mode == "shared" else None
+    # Satu background per "section" 10 slide, seperti merge_and_generate
+    for i in range(n_slides):
+        slide = prs.slides.add_slide(prs.slide_layouts[6])
+        bg = bg_paths[(i // 10) % len(bg_paths)]
+        logic.apply_background(prs, slide, bg, True, image_parts)
+    out = BytesIO()
+    prs.save(out)
+    return out.getbuffer().nbytes
+
+
+def run(mode, n_slides, bg_paths, repeat):
+    times = []
+    peak = 0
+    size = 0
+    for _ in range(repeat):
+        tracemalloc.start()
+        t0 = time.perf_counter()
+        size = build_deck(n_slides, bg_paths, mode)
+        times.append(time.perf_counter() - t0)
+        peak = max(peak, tracemalloc.get_traced_memory()[1])
+        tracemalloc.stop()
+    return min(times), peak, size
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--slides", type=int, default=150)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    bg_paths = backgrounds.registry.files()[:15]
+    if not bg_paths:
+        sys.exit("Folder pics/ kosong.")
+    # Panaskan registry supaya yang diukur hanya biaya pemasangan
+    for path in bg_paths:
+        backgrounds.registry.get(path)
+
+    print(f"{args.slides} slide, {len(bg_paths)} background")
+    print(f"{'mode':<8} {'waktu (s)':>10} {'peak (MB)':>10} {'ukuran (KB)':>12}")
+    for mode in ("slide", "shared"):
+        elapsed, peak, size = run(mode, args.slides, bg_paths, args.repeat)
+        print(f"{mode:<8} {elapsed:>10.3f} {peak / 1e6:>10.1f} {size / 1e3:>12.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,249 @@
+# benchmarks/bench_pipeline.py
+#
+# Ukur setiap tahap pembuatan deck (deteksi format, extract_cover,
+# extract_isi, generate_slides, prs.save, generate_warta, deck lengkap)
+# untuk semua format dan mode, dengan dokumen buatan synthetic_docs.py.
+# Hasil bisa disimpan sebagai baseline lalu dibandingkan di run berikutnya.
+#
+#   python benchmarks/bench_pipeline.py [--sections 20] [--images 2]
+#   python benchmarks/bench_pipeline.py --save-baseline
+#   python benchmarks/bench_pipeline.py --compare [--tolerance 0.25]
+#
+# Waktu adalah yang tercepat dari --repeat kali; peak memory diukur
+# dengan tracemalloc di satu run terpisah (hanya alokasi Python, bukan
+# memori lxml), supaya tracemalloc tidak ikut memperlambat waktu.
+
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+from copy import deepcopy
+from io import BytesIO
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pptx  # noqa: E402
+from docx import Document  # noqa: E402
+from pptx import Presentation  # noqa: E402
+
+import liturgy_registry  # noqa: E402
+import logic  # noqa: E402
+import section_cache  # noqa: E402
+import slidenauli  # noqa: E402
+import synthetic_docs  # noqa: E402
+import warta.warta_normal as warta_normal  # noqa: E402
+import warta.warta_wide as warta_wide  # noqa: E402
+from doc_analysis import analyze  # noqa: E402
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                             "baselines", "pipeline.json")
+ENTRY_POINTS = {"Projector": "ppt", "YouTube": "ppt_stream"}
+# Selisih di bawah ini dianggap noise, berapa pun persentasenya
+MIN_DELTA_SECONDS = 0.005
+MIN_DELTA_BYTES = 1024 * 1024
+
+
+def measure(func, setup=tuple, repeat=3):
+    """
+    Jalankan `func(*setup())` beberapa kali; setup tidak ikut diukur.
+
+    Returns:
+        (detik tercepat, peak bytes, hasil run terakhir)
+    """
+    times = []
+    result = None
+    for _ in range(repeat):
+        args = setup()
+        t0 = time.perf_counter()
+        result = func(*args)
+        times.append(time.perf_counter() - t0)
+
+    args = setup()
+    tracemalloc.start()
+    try:
+        func(*args)
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return min(times), peak, result
+
+
+def _save(prs):
+    out = BytesIO()
+    prs.save(out)
+    return out.getbuffer().nbytes
+
+
+def _generate(gen_slides, cover_info, data_isi):
+    prs = Presentation()
+    gen_slides(prs, deepcopy(cover_info), data_isi)
+    return prs
+
+
+def _warta(generate_warta, doc):
+    prs = Presentation()
+    generate_warta(doc, prs)
+    return prs
+
+
+def bench_format(fmt, tata, warta_docs, args, record):
+    """Ukur semua tahap untuk satu format; hasil dikirim ke `record`."""
+    repeat = args.repeat
+
+    seconds, peak, _ = measure(logic.detect_format_bytes, lambda: (tata,), repeat)
+    record(fmt, "-", "detect_format", seconds, peak)
+    seconds, peak, analysis = measure(analyze, lambda: (tata,), repeat)
+    record(fmt, "-", "analyze", seconds, peak)
+
+    extract_cover = liturgy_registry.load(fmt, "cover").extract_cover
+    seconds, peak, data_cover = measure(extract_cover, lambda: (analysis,), repeat)
+    record(fmt, "-", "extract_cover", seconds, peak)
+    extract_isi = liturgy_registry.load(fmt, "isi").extract_isi
+    seconds, peak, data_isi = measure(extract_isi, lambda: (analysis,), repeat)
+    record(fmt, "-", "extract_isi", seconds, peak)
+
+    warta_fmt = "Warta Remaja" if fmt == "Ibadah Remaja" else "Warta Jemaat"
+    w_mode = slidenauli.warta_mode(fmt, warta_fmt)
+    warta_doc = warta_docs[w_mode]
+
+    for mode, entry_point in ENTRY_POINTS.items():
+        if not liturgy_registry.has_entry_point(fmt, entry_point):
+            continue
+        gen_slides = liturgy_registry.load(fmt, entry_point).generate_slides
+        cover_info = {
+            "minggu": data_cover.get("minggu", ""),
+            "topik": data_cover.get("topik", ""),
+            "tanggal": data_cover.get("tanggal", ""),
+            "use_bg": args.bg,
+            "mode": mode,
+        }
+
+        seconds, peak, prs = measure(
+            _generate, lambda: (gen_slides, cover_info, data_isi), repeat)
+        record(fmt, mode, "generate_slides", seconds, peak, slides=len(prs.slides))
+        seconds, peak, size = measure(_save, lambda: (prs,), repeat)
+        record(fmt, mode, "prs.save", seconds, peak, size=size)
+
+        def deck():
+            output = logic.merge_and_generate(
+                warta_doc, deepcopy(cover_info), data_isi, gen_slides, w_mode,
+                workers=0, seed=0)
+            return output.getbuffer().nbytes
+
+        seconds, peak, size = measure(deck, repeat=repeat)
+        record(fmt, mode, "deck", seconds, peak, size=size)
+
+
+def run(args):
+    results = {}
+
+    def record(fmt, mode, stage, seconds, peak, **extra):
+        results[f"{fmt}|{mode}|{stage}"] = dict(seconds=seconds, peak_bytes=peak, **extra)
+        extra_text = " ".join(f"{k}={v}" for k, v in extra.items())
+        print(f"{fmt:<22} {mode:<9} {stage:<22} {seconds * 1000:>9.1f} "
+              f"{peak / 1e6:>9.1f}  {extra_text}")
+
+    warta_docs = {
+        "Normal": Document(BytesIO(synthetic_docs.make_warta(
+            args.warta_sections, args.paragraphs, args.warta_images))),
+        "Wide": Document(BytesIO(synthetic_docs.make_warta(
+            args.warta_sections, args.paragraphs, args.warta_images, remaja=True))),
+    }
+
+    print(f"{'format':<22} {'mode':<9} {'tahap':<22} {'ms':>9} {'peak MB':>9}")
+    for w_mode, generate_warta in (("Normal", warta_normal.generate_warta),
+                                   ("Wide", warta_wide.generate_warta)):
+        seconds, peak, prs = measure(
+            _warta, lambda: (generate_warta, warta_docs[w_mode]), args.repeat)
+        record("Warta", w_mode, "generate_warta", seconds, peak, slides=len(prs.slides))
+
+    for fmt in args.formats:
+        tata = synthetic_docs.make_tata(fmt, args.sections, args.verses, args.lines,
+                                        args.images)
+        bench_format(fmt, tata, warta_docs, args, record)
+    return results
+
+
+def compare(results, baseline, tolerance):
+    """
+    Bandingkan hasil dengan baseline.
+
+    Returns:
+        list pesan regresi (kosong jika tidak ada)
+    """
+    regressions = []
+    for key, base in baseline["results"].items():
+        current = results.get(key)
+        if current is None:
+            continue
+        checks = (("seconds", MIN_DELTA_SECONDS, "waktu"),
+                  ("peak_bytes", MIN_DELTA_BYTES, "peak memory"),
+                  ("size", 0, "ukuran output"))
+        for field, min_delta, label in checks:
+            old, new = base.get(field), current.get(field)
+            if old is None or new is None:
+                continue
+            if new > old * (1 + tolerance) and new - old > min_delta:
+                regressions.append(f"{key}: {label} {old:.4g} -> {new:.4g} "
+                                   f"(+{(new / old - 1) * 100 if old else 100:.0f}%)")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--formats", nargs="+", choices=liturgy_registry.formats(),
+                        default=liturgy_registry.formats())
+    parser.add_argument("--sections", type=int, default=20)
+    parser.add_argument("--verses", type=int, default=4)
+    parser.add_argument("--lines", type=int, default=4)
+    parser.add_argument("--images", type=int, default=2, help="gambar di tata ibadah")
+    parser.add_argument("--warta-sections", type=int, default=8)
+    parser.add_argument("--paragraphs", type=int, default=3, help="paragraf per pengumuman")
+    parser.add_argument("--warta-images", type=int, default=1)
+    parser.add_argument("--bg", action="store_true", help="pakai background dari pics/")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--save-baseline", nargs="?", const=BASELINE_PATH, metavar="PATH")
+    parser.add_argument("--compare", nargs="?", const=BASELINE_PATH, metavar="PATH")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="kenaikan relatif yang masih dianggap normal")
+    args = parser.parse_args()
+
+    # Yang diukur adalah render sebenarnya, bukan cache atau process pool
+    section_cache.SECTION_CACHE = False
+    params = {k: getattr(args, k) for k in (
+        "sections", "verses", "lines", "images", "warta_sections", "paragraphs",
+        "warta_images", "bg")}
+
+    results = run(args)
+
+    if args.save_baseline:
+        os.makedirs(os.path.dirname(os.path.abspath(args.save_baseline)), exist_ok=True)
+        meta = {
+            "python": platform.python_version(),
+            "python-pptx": pptx.__version__,
+            "machine": platform.machine(),
+            "params": params,
+        }
+        with open(args.save_baseline, "w", encoding="utf-8") as f:
+            json.dump({"meta": meta, "results": results}, f, indent=1, sort_keys=True)
+        print(f"Baseline disimpan: {args.save_baseline}")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+        if baseline["meta"].get("params") != params:
+            print("Peringatan: parameter berbeda dengan baseline "
+                  f"{baseline['meta'].get('params')}")
+        regressions = compare(results, baseline, args.tolerance)
+        for message in regressions:
+            print("REGRESI", message)
+        if regressions:
+            sys.exit(1)
+        print(f"Tidak ada regresi dibanding {args.compare} (toleransi {args.tolerance:.0%})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,188 @@
+# benchmarks/synthetic_docs.py
+#
+# Dokumen Tata Ibadah dan Warta buatan untuk benchmark. Strukturnya
+# mengikuti pola yang dikenali detect_format, extract_cover dan
+# extract_isi setiap format, sehingga ukurannya bisa diatur tanpa
+# bergantung pada dokumen jemaat asli.
+#
+#   python benchmarks/synthetic_docs.py --format "Ibadah Batak Umum" -o tata.docx
+#   python benchmarks/synthetic_docs.py --warta --images 2 -o warta.docx
+
+import argparse
+import random
+from io import BytesIO
+
+from docx import Document
+from docx.shared import Inches
+from PIL import Image
+
+# Baris pembuka per format: harus memuat keyword FORMAT_RULES di logic.py
+# dan (untuk SKM) penanda awal tata ibadah
+HEADERS = {
+    "Ibadah Indonesia Umum": ["TATA IBADAH MINGGU", "PUKUL 10.00 WIB"],
+    "Ibadah Batak Umum": ["AGENDA PARMINGGUON", "PUKUL 07.00 WIB"],
+    "Ibadah Remaja": ["TATA IBADAH REMAJA", "NAPOSOBULUNG"],
+    "Ibadah Sore": ["TATA IBADAH SORE", "PUKUL 17.00 WIB"],
+    "Sekolah Minggu (SKM)": ["TATA TERTIB SEKOLAH MINGGU", "KEBAKTIAN ANAK"],
+}
+
+# Urutan acara yang diulang sampai jumlah section terpenuhi.
+# (judul, jenis isi): "lagu" = bait lagu, "liturgi" = baris P:/J:
+ACARA_UMUM = [
+    ("BERNYANYI KJ No. {n}", "lagu"),
+    ("VOTUM", "liturgi"),
+    ("HUKUM TAURAT", "liturgi"),
+    ("BERNYANYI KJ No. {n}", "lagu"),
+    ("PENGAKUAN DOSA", "liturgi"),
+    ("EPISTEL", "liturgi"),
+    ("PENGAKUAN IMAN", "liturgi"),
+    ("KOOR - Ama", "lagu"),
+    ("WARTA JEMAAT", None),
+    ("KHOTBAH", "liturgi"),
+    ("DOA", "liturgi"),
+]
+ACARA_BATAK = [
+    ("MARENDE BE No. {n}", "lagu"),
+    ("VOTUM", "liturgi"),
+    ("PATIK", "liturgi"),
+    ("MARENDE BE No. {n}", "lagu"),
+    ("MANOPOTI DOSA", "liturgi"),
+    ("EPISTEL", "liturgi"),
+    ("KOOR - Ina", "lagu"),
+    ("TINGTING", None),
+    ("JAMITA", "liturgi"),
+    ("TANGIANG", "liturgi"),
+]
+
+# Tanpa kata keyword acara (DOA, BERKAT, ...) supaya isi tidak membuka section baru
+WORDS = ("kasih", "damai", "Tuhan", "kudus", "jemaat", "sukacita", "terang",
+         "hidup", "firman", "pengharapan", "setia", "anugerah", "iman")
+
+
+def _sentence(rng, n_words):
+    return " ".join(rng.choice(WORDS) for _ in range(n_words)).capitalize()
+
+
+def _image_bytes(rng, size=(800, 600)):
+    # Noise supaya ukuran gambar mendekati foto (tidak bisa dikompres);
+    # dari `rng` supaya dokumen dengan seed sama selalu identik
+    img = Image.frombytes("RGB", size, rng.randbytes(size[0] * size[1] * 3))
+    buf = BytesIO()
+    img.save(buf, "JPEG", quality=85)
+    buf.seek(0)
+    return buf
+
+
+def _save(doc):
+    buf = BytesIO()
+    doc.save(buf)
+    return buf.getvalue()
+
+
+def make_tata(fmt, sections=12, verses=4, lines=4, images=0, seed=0):
+    """
+    Bytes .docx tata ibadah buatan untuk format `fmt`.
+
+    Args:
+        fmt: salah satu format di HEADERS
+        sections: jumlah acara bernomor (maks. 99, batas re_nomor)
+        verses: jumlah bait per lagu
+        lines: jumlah baris per bait, juga jumlah baris P:/J: per acara liturgi
+        images: jumlah gambar yang disisipkan di antara acara
+        seed: seed isi teks
+
+    Returns:
+        bytes
+    """
+    if fmt not in HEADERS:
+        raise RuntimeError(f"Format '{fmt}' tidak punya generator dokumen")
+    if not 1 <= sections <= 99:
+        raise RuntimeError("Jumlah section harus 1..99")
+
+    rng = random.Random(seed)
+    acara = ACARA_BATAK if fmt == "Ibadah Batak Umum" else ACARA_UMUM
+    doc = Document()
+    for text in HEADERS[fmt]:
+        doc.add_paragraph(text)
+    doc.add_paragraph("MINGGU XX SETELAH TRINITATIS")
+    doc.add_paragraph("MINGGU, 12 OKTOBER 2025")
+    doc.add_paragraph("TOPIK: " + _sentence(rng, 3).upper())
+    doc.add_paragraph("")
+
+    image_every = sections // images if images else 0
+    for i in range(1, sections + 1):
+        title, kind = acara[(i - 1) % len(acara)]
+        doc.add_paragraph(f"{i}. " + title.format(n=rng.randint(1, 600)))
+        if kind == "lagu":
+            for _ in range(verses):
+                # Bait dipisah paragraf kosong; nomor bait "1." akan
+                # terbaca sebagai acara baru
+                doc.add_paragraph("")
+                for _ in range(lines):
+                    doc.add_paragraph(_sentence(rng, 6))
+        elif kind == "liturgi":
+            for j in range(lines):
+                doc.add_paragraph(("P: ", "J: ")[j % 2] + _sentence(rng, 12))
+        if image_every and i % image_every == 0 and i // image_every <= images:
+            doc.add_picture(_image_bytes(rng), width=Inches(3))
+    return _save(doc)
+
+
+def make_warta(sections=6, paragraphs=3, images=1, remaja=False, seed=0):
+    """
+    Bytes .docx warta buatan, bisa dipakai warta_normal maupun warta_wide.
+
+    Args:
+        sections: jumlah pengumuman bernomor
+        paragraphs: jumlah paragraf per pengumuman
+        images: jumlah gambar (warta menyalinnya menjadi slide sendiri)
+        remaja: buat "Warta Remaja" (untuk warta mode Wide)
+        seed: seed isi teks
+
+    Returns:
+        bytes
+    """
+    rng = random.Random(seed)
+    doc = Document()
+    doc.add_paragraph("WARTA REMAJA" if remaja else "WARTA JEMAAT")
+    doc.add_paragraph("Minggu, 12 Oktober 2025")
+    doc.add_paragraph("Pelayan minggu ini: " + _sentence(rng, 4))
+    doc.add_paragraph("TOPIK: " + _sentence(rng, 3).upper())
+    for i in range(1, sections + 1):
+        if i % 4 == 1:
+            doc.add_paragraph(("I", "II", "III", "IV", "V")[(i // 4) % 5] + ". " +
+                              _sentence(rng, 2).upper())
+        doc.add_paragraph(f"{i}. " + _sentence(rng, 3))
+        for _ in range(paragraphs):
+            doc.add_paragraph(_sentence(rng, 30) + ".")
+    for _ in range(images):
+        doc.add_picture(_image_bytes(rng), width=Inches(4))
+    return _save(doc)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--format", default="Ibadah Indonesia Umum", choices=list(HEADERS))
+    parser.add_argument("--warta", action="store_true", help="buat warta, bukan tata ibadah")
+    parser.add_argument("--remaja", action="store_true", help="warta remaja")
+    parser.add_argument("--sections", type=int, default=12)
+    parser.add_argument("--verses", type=int, default=4)
+    parser.add_argument("--lines", type=int, default=4)
+    parser.add_argument("--paragraphs", type=int, default=3)
+    parser.add_argument("--images", type=int, default=0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("-o", "--output", required=True)
+    args = parser.parse_args()
+
+    if args.warta:
+        data = make_warta(args.sections, args.paragraphs, args.images, args.remaja, args.seed)
+    else:
+        data = make_tata(args.format, args.sections, args.verses, args.lines,
+                         args.images, args.seed)
+    with open(args.output, "wb") as f:
+        f.write(data)
+    print(f"{args.output}: {len(data) / 1e3:.0f} KB")
+
+
+if __name__ == "__main__":
+    main()
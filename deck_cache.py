@@ -0,0 +1,87 @@
+# deck_cache.py
+import functools
+import glob
+import json
+import os
+
+import pptx
+
+import backgrounds
+from disk_cache import DiskCache, MemoryCache, files_token, sha256_hex
+
+# Cache file .pptx jadi di app.py; "0" untuk mematikan
+DECK_CACHE = os.getenv("SLIDENAULI_DECK_CACHE", "1") != "0"
+MEMORY_MAX_BYTES = int(
+    float(os.getenv("SLIDENAULI_DECK_CACHE_MEMORY_MB", "64")) * 1024 * 1024)
+
+_ROOT = os.path.dirname(os.path.abspath(__file__))
+# File yang menentukan isi deck; deck lama tidak berlaku jika salah satunya berubah
+SOURCE_PATTERNS = ("*.py", "warta/*.py", "profiles/*.json",
+                   "indo_umum/*.py", "batak_umum/*.py", "remaja/*.py",
+                   "sore/*.py", "skm/*.py")
+
+_disk = DiskCache("decks", int(
+    float(os.getenv("SLIDENAULI_DECK_CACHE_MB", "300")) * 1024 * 1024))
+_memory = MemoryCache(MEMORY_MAX_BYTES)
+
+
+@functools.lru_cache(maxsize=None)
+def _source_token():
+    paths = [path for pattern in SOURCE_PATTERNS
+             for path in sorted(glob.glob(os.path.join(_ROOT, pattern)))]
+    return files_token(paths, _ROOT, pptx.__version__)
+
+
+def _background_state():
+    # Background yang tersedia ikut menentukan hasil jika background dipakai
+    state = []
+    for path in backgrounds.registry.files():
+        try:
+            st = os.stat(path)
+        except OSError:
+            continue
+        state.append([os.path.basename(path), st.st_mtime_ns, st.st_size])
+    return state
+
+
+def deck_key(tata_hash, warta_hash, fmt, mode, use_bg, warta_mode, bg_mode="shared"):
+    """
+    Kunci cache (sha256 hex) untuk deck dari dokumen dan pengaturan ini.
+
+    Bukan seed pilihan background: kunci ikut berubah jika file background
+    disentuh, sedangkan seed (logic.deck_seed) hanya dari isi dokumen.
+    """
+    payload = {
+        "code": _source_token(),
+        "tata": tata_hash,
+        "warta": warta_hash,
+        "format": fmt,
+        "mode": mode,
+        "warta_mode": warta_mode,
+        "use_bg": bool(use_bg),
+        "bg_mode": bg_mode if use_bg else None,
+        "backgrounds": _background_state() if use_bg else None,
+        "bg_quality": backgrounds.JPEG_QUALITY,
+    }
+    return sha256_hex(json.dumps(payload, sort_keys=True).encode())
+
+
+def get(key):
+    """Bytes .pptx untuk `key`, atau None."""
+    data = _memory.get(key)
+    if data is not None:
+        return data
+    data = _disk.get(key)
+    if data is not None:
+        _memory.put(key, data, len(data))
+    return data
+
+
+def put(key, data):
+    _memory.put(key, data, len(data))
+    _disk.put(key, data)
+
+
+def clear():
+    _memory.clear()
+    _disk.clear()
@@ -0,0 +1,166 @@
+# disk_cache.py
+import hashlib
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+
+# Lokasi cache di disk, bisa diatur lewat environment
+CACHE_ROOT = os.getenv(
+    "SLIDENAULI_CACHE_DIR",
+    os.path.join(os.path.expanduser("~"), ".cache", "slidenauli"))
+
+
+def sha256_hex(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def files_token(paths, root, salt=""):
+    """
+    Hash isi (dan path relatif terhadap `root`) dari file kode yang
+    menentukan isi cache; entri lama tidak berlaku jika salah satunya berubah.
+
+    Args:
+        paths: path file, urutannya ikut menentukan hasil
+        root: folder acuan path relatif
+        salt: teks tambahan, misalnya versi python-pptx
+
+    Returns:
+        sha256 hex
+    """
+    h = hashlib.sha256(salt.encode())
+    for path in paths:
+        h.update(os.path.relpath(path, root).encode())
+        with open(path, "rb") as f:
+            h.update(f.read())
+    return h.hexdigest()
+
+
+class MemoryCache:
+    """
+    Cache LRU di memori proses di depan DiskCache, dibatasi total ukuran.
+    Nilai yang lebih besar dari batas tidak disimpan di memori.
+    """
+
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self.lock = threading.Lock()
+        self._entries = OrderedDict()
+        self._bytes = 0
+
+    def get(self, key):
+        with self.lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            self._entries.move_to_end(key)
+            return entry[0]
+
+    def put(self, key, value, size):
+        """Simpan `value` yang ukurannya `size` bytes."""
+        if size > self.max_bytes:
+            return
+        with self.lock:
+            if key in self._entries:
+                return
+            self._entries[key] = (value, size)
+            self._bytes += size
+            while self._bytes > self.max_bytes:
+                _, (_, old_size) = self._entries.popitem(last=False)
+                self._bytes -= old_size
+
+    def clear(self):
+        with self.lock:
+            self._entries.clear()
+            self._bytes = 0
+
+
+class DiskCache:
+    """
+    Cache bytes di disk dengan kunci string (biasanya hash isi),
+    dibatasi total ukuran dan dibuang dengan urutan LRU.
+
+    Waktu akses disimpan sebagai mtime file, jadi urutan LRU tetap
+    terjaga walaupun proses Streamlit di-restart. Semua error I/O
+    diperlakukan sebagai cache miss supaya cache tidak pernah
+    menggagalkan proses utama.
+    """
+
+    def __init__(self, name, max_bytes):
+        self.dir = os.path.join(CACHE_ROOT, name)
+        self.max_bytes = max_bytes
+        self.lock = threading.Lock()
+        # Perkiraan total ukuran; folder hanya di-scan jika melewati batas
+        self._approx_bytes = None
+
+    def _path(self, key):
+        return os.path.join(self.dir, key)
+
+    def get(self, key):
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+            os.utime(path)
+            return data
+        except OSError:
+            return None
+
+    def put(self, key, data):
+        if len(data) > self.max_bytes:
+            return
+        try:
+            os.makedirs(self.dir, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self.dir, prefix=".tmp_")
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    f.write(data)
+                os.replace(tmp_path, self._path(key))
+            except BaseException:
+                # File sementara tidak boleh tertinggal (tidak ikut dihitung
+                # di _approx_bytes dan tidak pernah dibuang _evict)
+                try:
+                    os.remove(tmp_path)
+                except OSError:
+                    pass
+                raise
+        except OSError:
+            return
+        with self.lock:
+            if self._approx_bytes is not None:
+                self._approx_bytes += len(data)
+            if self._approx_bytes is not None and self._approx_bytes <= self.max_bytes:
+                return
+        self._evict()
+
+    def _evict(self):
+        with self.lock:
+            try:
+                entries = []
+                for entry in os.scandir(self.dir):
+                    if entry.is_file() and not entry.name.startswith(".tmp_"):
+                        st = entry.stat()
+                        entries.append((st.st_mtime, st.st_size, entry.path))
+            except OSError:
+                return
+
+            total = sum(size for _, size, _ in entries)
+            entries.sort()
+            for _, size, path in entries:
+                if total <= self.max_bytes:
+                    break
+                try:
+                    os.remove(path)
+                    total -= size
+                except OSError:
+                    pass
+            self._approx_bytes = total
+
+    def clear(self):
+        with self.lock:
+            try:
+                for entry in os.scandir(self.dir):
+                    os.remove(entry.path)
+            except OSError:
+                pass
+            self._approx_bytes = None
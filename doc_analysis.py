@@ -0,0 +1,79 @@
+# doc_analysis.py
+import re
+
+from docx.oxml.ns import qn
+
+from docx_reader import read_paragraph_texts
+
+_RE_SPACES = re.compile(r"\s+")
+
+
+class DocumentAnalysis:
+    """
+    Teks paragraf tata ibadah yang dihitung sekali per dokumen dan
+    dipakai bersama oleh deteksi format, ekstraksi cover dan ekstraksi isi.
+
+    `texts` berisi teks mentah semua paragraf body (termasuk yang kosong,
+    sama seperti `doc.paragraphs`). List lainnya hanya untuk paragraf yang
+    tidak kosong, dengan indeks yang saling sejajar:
+
+        stripped   : teks tanpa spasi di awal/akhir
+        normalized : spasi beruntun digabung menjadi satu spasi
+        upper      : `normalized` dalam huruf besar
+        nospace    : `upper` tanpa spasi (bentuk untuk KeywordMatcher)
+    """
+
+    __slots__ = ("texts", "stripped", "normalized", "upper", "nospace")
+
+    def __init__(self, texts):
+        self.texts = texts
+        self.stripped = []
+        self.normalized = []
+        self.upper = []
+        self.nospace = []
+        for text in texts:
+            stripped = text.strip()
+            if not stripped:
+                continue
+            normalized = _RE_SPACES.sub(" ", stripped)
+            upper = normalized.upper()
+            self.stripped.append(stripped)
+            self.normalized.append(normalized)
+            self.upper.append(upper)
+            self.nospace.append(upper.replace(" ", ""))
+
+    @classmethod
+    def from_document(cls, doc):
+        """Baca teks langsung dari elemen `w:p` body, tanpa proxy Paragraph."""
+        body = doc.element.body
+        return cls([p.text for p in body.iterchildren(qn("w:p"))])
+
+    @classmethod
+    def from_bytes(cls, data):
+        """Baca teks dari bytes .docx dengan `docx_reader`, tanpa membangun Document."""
+        return cls(read_paragraph_texts(data))
+
+    def lines(self):
+        """(normalized, upper, nospace) untuk setiap paragraf yang tidak kosong."""
+        return zip(self.normalized, self.upper, self.nospace)
+
+
+def analyze(doc):
+    """
+    DocumentAnalysis untuk `doc`.
+
+    Args:
+        doc: python-docx Document, bytes .docx, atau DocumentAnalysis yang
+            sudah ada (dikembalikan apa adanya)
+
+    Returns:
+        DocumentAnalysis
+
+    Raises:
+        RuntimeError: jika bytes bukan .docx yang valid
+    """
+    if isinstance(doc, DocumentAnalysis):
+        return doc
+    if isinstance(doc, (bytes, bytearray)):
+        return DocumentAnalysis.from_bytes(doc)
+    return DocumentAnalysis.from_document(doc)
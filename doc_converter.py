@@ -3,16 +3,363 @@ import subprocess
 import tempfile
 import os
 import shutil
+import threading
+import time
+import atexit
+import pathlib
+import queue
+from concurrent.futures import ThreadPoolExecutor
+from disk_cache import DiskCache, sha256_hex
+import instrumentation
 
+try:
+    import uno
+    from com.sun.star.beans import PropertyValue
+    from com.sun.star.io import IOException as UnoIOException
+    from com.sun.star.lang import IllegalArgumentException
+    # Error UNO karena isi dokumen (rusak / format tidak didukung), bukan
+    # karena koneksi ke soffice putus
+    _DOCUMENT_ERRORS = (UnoIOException, IllegalArgumentException, RuntimeError)
+except ImportError:
+    uno = None
+    _DOCUMENT_ERRORS = (RuntimeError,)
 
-def convert_doc_to_docx(file_bytes: bytes, filename: str) -> bytes:
+# Batas waktu konversi (detik), bisa diatur lewat environment
+LO_TIMEOUT = float(os.getenv("SLIDENAULI_LO_TIMEOUT", "60"))
+# Batas waktu menunggu LibreOffice siap menerima koneksi UNO
+LO_STARTUP_TIMEOUT = float(os.getenv("SLIDENAULI_LO_STARTUP_TIMEOUT", "30"))
+# Set "0" untuk mematikan worker persisten dan selalu memakai soffice sekali jalan
+LO_DAEMON = os.getenv("SLIDENAULI_LO_DAEMON", "1") != "0"
+# Jumlah worker konversi yang boleh jalan bersamaan
+LO_WORKERS = int(os.getenv("SLIDENAULI_LO_WORKERS",
+                 str(min(4, os.cpu_count() or 1))))
+# Jumlah maksimum permintaan yang boleh menunggu worker bebas
+LO_MAX_QUEUE = int(os.getenv("SLIDENAULI_LO_MAX_QUEUE", "16"))
+# Batas waktu menunggu giliran di antrian (detik)
+LO_QUEUE_TIMEOUT = float(os.getenv("SLIDENAULI_LO_QUEUE_TIMEOUT", "120"))
+# Ukuran maksimum cache hasil konversi di disk (MB)
+DOCX_CACHE_MB = float(os.getenv("SLIDENAULI_DOCX_CACHE_MB", "200"))
+
+# Hasil konversi disimpan berdasarkan SHA-256 isi file .doc
+_docx_cache = DiskCache("docx", int(DOCX_CACHE_MB * 1024 * 1024))
+
+
+def _find_libreoffice():
+    lo_path = shutil.which("libreoffice") or shutil.which("soffice")
+    if not lo_path:
+        raise RuntimeError(
+            "LibreOffice tidak ditemukan. "
+            "Tambahkan 'libreoffice' ke packages.txt di Streamlit Cloud, "
+            "atau install via: sudo apt-get install libreoffice"
+        )
+    return lo_path
+
+
+def _prop(name, value):
+    p = PropertyValue()
+    p.Name = name
+    p.Value = value
+    return p
+
+
+def _convert_oneshot(lo_path, tmpdir, input_paths, timeout, profile_dir=None):
+    # Jalankan LibreOffice headless untuk konversi (satu atau banyak file)
+    if isinstance(input_paths, str):
+        input_paths = [input_paths]
+    cmd = [lo_path]
+    if profile_dir:
+        cmd.append(f"-env:UserInstallation={pathlib.Path(profile_dir).as_uri()}")
+    cmd += [
+        "--headless",
+        "--convert-to", "docx",
+        "--outdir", tmpdir,
+    ] + list(input_paths)
+    try:
+        result = subprocess.run(
+            cmd,
+            capture_output=True,
+            text=True,
+            timeout=timeout,
+        )
+    except subprocess.TimeoutExpired:
+        raise RuntimeError(
+            f"Konversi melebihi batas waktu {timeout:g} detik.")
+
+    if result.returncode != 0:
+        raise RuntimeError(
+            f"LibreOffice gagal mengkonversi file.\n"
+            f"stderr: {result.stderr}\nstdout: {result.stdout}"
+        )
+    return result.stdout
+
+
+class _LibreOfficeWorker:
+    """
+    Satu slot konversi dengan profil LibreOffice sendiri
+    (-env:UserInstallation), supaya beberapa soffice bisa jalan
+    bersamaan tanpa saling mengunci profil.
+
+    Jika modul `uno` tersedia, slot ini menjalankan soffice headless yang
+    hidup terus dan menerima perintah konversi lewat UNO pipe, sehingga
+    biaya start-up hanya dibayar sekali. Jika tidak, soffice dijalankan
+    sekali per file dengan profil milik slot ini.
+    """
+
+    def __init__(self, lo_path, index):
+        self.lo_path = lo_path
+        self.pipe_name = f"slidenauli_{os.getpid()}_{index}"
+        self.profile_dir = tempfile.mkdtemp(
+            prefix=f"slidenauli_lo_profile_{index}_")
+        self.persistent = uno is not None and LO_DAEMON
+        self.proc = None
+        self.desktop = None
+
+    def _alive(self):
+        return self.proc is not None and self.proc.poll() is None
+
+    def start(self):
+        self.stop()
+        self.proc = subprocess.Popen(
+            [
+                self.lo_path,
+                f"-env:UserInstallation={pathlib.Path(self.profile_dir).as_uri()}",
+                "--headless",
+                "--invisible",
+                "--norestore",
+                "--nologo",
+                "--nodefault",
+                f"--accept=pipe,name={self.pipe_name};urp;StarOffice.ComponentContext",
+            ],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+
+        local_ctx = uno.getComponentContext()
+        resolver = local_ctx.ServiceManager.createInstanceWithContext(
+            "com.sun.star.bridge.UnoUrlResolver", local_ctx)
+        url = f"uno:pipe,name={self.pipe_name};urp;StarOffice.ComponentContext"
+
+        deadline = time.monotonic() + LO_STARTUP_TIMEOUT
+        while True:
+            try:
+                ctx = resolver.resolve(url)
+                break
+            except Exception:
+                if not self._alive() or time.monotonic() > deadline:
+                    self.stop()
+                    raise RuntimeError(
+                        "LibreOffice worker gagal dijalankan.")
+                time.sleep(0.25)
+
+        self.desktop = ctx.ServiceManager.createInstanceWithContext(
+            "com.sun.star.frame.Desktop", ctx)
+
+    def stop(self):
+        self.desktop = None
+        proc, self.proc = self.proc, None
+        if proc is not None and proc.poll() is None:
+            proc.kill()
+            proc.wait()
+
+    def close(self):
+        self.stop()
+        shutil.rmtree(self.profile_dir, ignore_errors=True)
+
+    def _convert_once(self, input_path, output_path, timeout):
+        # Watchdog: jika konversi macet, proses dimatikan sehingga
+        # panggilan UNO yang sedang berjalan ikut gagal.
+        timer = threading.Timer(timeout, self.stop)
+        timer.start()
+        try:
+            doc = self.desktop.loadComponentFromURL(
+                uno.systemPathToFileUrl(input_path), "_blank", 0,
+                (_prop("Hidden", True), _prop("ReadOnly", True)))
+            if doc is None:
+                raise RuntimeError("LibreOffice tidak bisa membuka file.")
+            try:
+                doc.storeToURL(
+                    uno.systemPathToFileUrl(output_path),
+                    (_prop("FilterName", "MS Word 2007 XML"),))
+            finally:
+                doc.close(True)
+        finally:
+            timer.cancel()
+
+        if not self._alive():
+            raise RuntimeError(
+                f"Konversi melebihi batas waktu {timeout:g} detik.")
+
+    def convert(self, input_path, output_path, timeout):
+        """Konversi satu file; mengembalikan stdout soffice (jika ada)."""
+        if not self.persistent:
+            return _convert_oneshot(
+                self.lo_path, os.path.dirname(output_path), input_path,
+                timeout, self.profile_dir)
+
+        # Restart otomatis jika proses mati (crash / kill oleh watchdog)
+        if not self._alive() or self.desktop is None:
+            self.start()
+        try:
+            self._convert_once(input_path, output_path, timeout)
+        except Exception as e:
+            if self._alive() and isinstance(e, _DOCUMENT_ERRORS):
+                # Hanya file ini yang gagal; worker tetap dipakai tanpa restart
+                message = getattr(e, "Message", None) or str(e)
+                raise RuntimeError(
+                    f"LibreOffice gagal mengkonversi file.\n{message}") from e
+            timed_out = not self._alive()
+            self.stop()
+            if timed_out or isinstance(e, RuntimeError):
+                raise RuntimeError(
+                    f"LibreOffice gagal mengkonversi file.\n{e}") from e
+            # Koneksi putus di tengah jalan: coba sekali lagi dengan proses baru
+            self.start()
+            try:
+                self._convert_once(input_path, output_path, timeout)
+            except Exception as e2:
+                self.stop()
+                raise RuntimeError(
+                    f"LibreOffice gagal mengkonversi file.\n{e2}") from e2
+        return ""
+
+    def convert_batch(self, input_paths, outdir, timeout):
+        """
+        Konversi banyak file ke `outdir`. Mode sekali jalan memakai satu
+        panggilan soffice untuk semua file; mode persisten memproses
+        satu per satu di proses yang sama. Hasil per file dicek oleh
+        pemanggil dari keberadaan file .docx di `outdir`.
+
+        Returns:
+            dict {input_path: pesan error} untuk file yang gagal (mode
+            sekali jalan tidak punya error per file, selalu kosong)
+        """
+        if not self.persistent:
+            _convert_oneshot(
+                self.lo_path, outdir, input_paths,
+                timeout * len(input_paths), self.profile_dir)
+            return {}
+
+        errors = {}
+        for input_path in input_paths:
+            base_name = os.path.splitext(os.path.basename(input_path))[0]
+            try:
+                self.convert(input_path, os.path.join(
+                    outdir, f"{base_name}.docx"), timeout)
+            except RuntimeError as e:
+                errors[input_path] = str(e)
+        return errors
+
+
+class _ConverterPool:
+    """
+    Kumpulan worker LibreOffice berukuran tetap dengan antrian di depannya.
+    Permintaan yang datang saat semua worker sibuk menunggu giliran; jika
+    antrian sudah penuh, permintaan langsung ditolak (back-pressure).
+    """
+
+    def __init__(self, lo_path, size, max_queue):
+        self.size = size
+        self.max_queue = max_queue
+        self.workers = [_LibreOfficeWorker(lo_path, i) for i in range(size)]
+        self.idle = queue.Queue()
+        for w in self.workers:
+            self.idle.put(w)
+        self.waiting = 0
+        self.lock = threading.Lock()
+
+    def status(self):
+        with self.lock:
+            waiting = self.waiting
+        return {
+            "workers": self.size,
+            "busy": self.size - self.idle.qsize(),
+            "waiting": waiting,
+            "max_queue": self.max_queue,
+        }
+
+    def run(self, job):
+        """Jalankan `job(worker)` di worker yang bebas, menunggu di antrian jika perlu."""
+        with self.lock:
+            if self.waiting >= self.max_queue:
+                raise RuntimeError(
+                    f"Antrian konversi penuh ({self.waiting} file menunggu). "
+                    "Silakan coba beberapa saat lagi."
+                )
+            self.waiting += 1
+        try:
+            worker = self.idle.get(timeout=LO_QUEUE_TIMEOUT)
+        except queue.Empty:
+            raise RuntimeError(
+                f"Tidak ada worker konversi yang bebas dalam {LO_QUEUE_TIMEOUT:g} detik.")
+        finally:
+            with self.lock:
+                self.waiting -= 1
+
+        try:
+            return job(worker)
+        finally:
+            self.idle.put(worker)
+
+    def convert(self, input_path, output_path, timeout):
+        return self.run(lambda w: w.convert(input_path, output_path, timeout))
+
+    def close(self):
+        for w in self.workers:
+            w.close()
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def _get_pool(lo_path):
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = _ConverterPool(lo_path, LO_WORKERS, LO_MAX_QUEUE)
+        return _pool
+
+
+def queue_status():
+    """
+    Kondisi antrian konversi saat ini.
+
+    Returns:
+        dict berisi jumlah worker, worker yang sibuk, permintaan yang
+        menunggu, dan batas antrian
+    """
+    with _pool_lock:
+        pool = _pool
+    if pool is None:
+        return {"workers": LO_WORKERS, "busy": 0, "waiting": 0, "max_queue": LO_MAX_QUEUE}
+    return pool.status()
+
+
+def shutdown_converter():
+    """Matikan semua worker LibreOffice (dipanggil otomatis saat exit)."""
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.close()
+            _pool = None
+
+
+atexit.register(shutdown_converter)
+
+
+def convert_doc_to_docx(file_bytes: bytes, filename: str, timeout: float = None) -> bytes:
     """
     Konversi file .doc ke .docx menggunakan LibreOffice (headless).
     Kompatibel dengan Streamlit Cloud (Linux) dan lokal.
 
+    Konversi dijalankan oleh salah satu worker di pool (lihat
+    `_ConverterPool`); jika semua sibuk, permintaan menunggu di antrian.
+    File yang isinya sama (SHA-256) langsung diambil dari cache disk.
+
     Args:
         file_bytes: isi file .doc dalam bytes
         filename: nama file asli (misal: "tata_ibadah.doc")
+        timeout: batas waktu konversi dalam detik (default: LO_TIMEOUT)
 
     Returns:
         bytes dari file .docx hasil konversi
@@ -20,14 +367,14 @@ def convert_doc_to_docx(file_bytes: bytes, filename: str) -> bytes:
     Raises:
         RuntimeError: jika LibreOffice tidak tersedia atau konversi gagal
     """
-    # Cek apakah LibreOffice tersedia
-    lo_path = shutil.which("libreoffice") or shutil.which("soffice")
-    if not lo_path:
-        raise RuntimeError(
-            "LibreOffice tidak ditemukan. "
-            "Tambahkan 'libreoffice' ke packages.txt di Streamlit Cloud, "
-            "atau install via: sudo apt-get install libreoffice"
-        )
+    cache_key = sha256_hex(file_bytes)
+    cached = _docx_cache.get(cache_key)
+    if cached is not None:
+        return cached
+
+    lo_path = _find_libreoffice()
+    if timeout is None:
+        timeout = LO_TIMEOUT
 
     with tempfile.TemporaryDirectory() as tmpdir:
         # Simpan file .doc ke temp folder
@@ -35,38 +382,113 @@ def convert_doc_to_docx(file_bytes: bytes, filename: str) -> bytes:
         with open(input_path, "wb") as f:
             f.write(file_bytes)
 
-        # Jalankan LibreOffice headless untuk konversi
-        result = subprocess.run(
-            [
-                lo_path,
-                "--headless",
-                "--convert-to", "docx",
-                "--outdir", tmpdir,
-                input_path,
-            ],
-            capture_output=True,
-            text=True,
-            timeout=60,
-        )
-
-        if result.returncode != 0:
-            raise RuntimeError(
-                f"LibreOffice gagal mengkonversi file.\n"
-                f"stderr: {result.stderr}\nstdout: {result.stdout}"
-            )
-
-        # Baca hasil konversi
         base_name = os.path.splitext(filename)[0]
         output_path = os.path.join(tmpdir, f"{base_name}.docx")
 
+        stdout = _get_pool(lo_path).convert(input_path, output_path, timeout)
+
         if not os.path.exists(output_path):
             raise RuntimeError(
                 f"File hasil konversi tidak ditemukan di: {output_path}\n"
-                f"stdout: {result.stdout}"
+                f"stdout: {stdout}"
             )
 
         with open(output_path, "rb") as f:
-            return f.read()
+            docx_bytes = f.read()
+
+    _docx_cache.put(cache_key, docx_bytes)
+    return docx_bytes
+
+
+def convert_many(files, timeout: float = None) -> dict:
+    """
+    Konversi banyak file .doc sekaligus (misal untuk backfill arsip).
+
+    Semua file ditulis ke satu folder sementara lalu dibagi rata ke
+    worker di pool; tiap worker mengkonversi bagiannya dalam satu
+    panggilan soffice. File yang sudah ada di cache tidak dikonversi
+    ulang, dan file yang bukan .doc dikembalikan apa adanya.
+
+    Args:
+        files: dict {nama_file: bytes} atau iterable (nama_file, bytes)
+        timeout: batas waktu per file dalam detik (default: LO_TIMEOUT)
+
+    Returns:
+        dict {nama_file: {"docx": bytes atau None, "error": str atau None}}
+    """
+    files = dict(files)
+    if timeout is None:
+        timeout = LO_TIMEOUT
+
+    results = {}
+    pending = []
+    for filename, file_bytes in files.items():
+        if not is_doc_file(filename):
+            results[filename] = {"docx": file_bytes, "error": None}
+            continue
+        cached = _docx_cache.get(sha256_hex(file_bytes))
+        if cached is not None:
+            results[filename] = {"docx": cached, "error": None}
+        else:
+            pending.append(filename)
+
+    if not pending:
+        return results
+
+    try:
+        lo_path = _find_libreoffice()
+    except RuntimeError as e:
+        for filename in pending:
+            results[filename] = {"docx": None, "error": str(e)}
+        return results
+
+    pool = _get_pool(lo_path)
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        outdir = os.path.join(tmpdir, "out")
+        os.makedirs(outdir)
+
+        # Nama file diberi nomor urut supaya nama keluaran tidak bentrok
+        input_paths = {}
+        for i, filename in enumerate(pending):
+            input_path = os.path.join(
+                tmpdir, f"{i:05d}_{os.path.basename(filename)}")
+            with open(input_path, "wb") as f:
+                f.write(files[filename])
+            input_paths[filename] = input_path
+
+        paths = list(input_paths.values())
+        chunks = [paths[i::pool.size] for i in range(pool.size)]
+        chunks = [c for c in chunks if c]
+        chunk_errors = {}
+
+        def run_chunk(chunk):
+            try:
+                chunk_errors.update(
+                    pool.run(lambda w: w.convert_batch(chunk, outdir, timeout)))
+            except RuntimeError as e:
+                for path in chunk:
+                    chunk_errors[path] = str(e)
+
+        with ThreadPoolExecutor(max_workers=len(chunks)) as executor:
+            list(executor.map(run_chunk, chunks))
+
+        for filename, input_path in input_paths.items():
+            base_name = os.path.splitext(os.path.basename(input_path))[0]
+            output_path = os.path.join(outdir, f"{base_name}.docx")
+            if os.path.exists(output_path):
+                with open(output_path, "rb") as f:
+                    docx_bytes = f.read()
+                _docx_cache.put(sha256_hex(files[filename]), docx_bytes)
+                results[filename] = {"docx": docx_bytes, "error": None}
+            else:
+                results[filename] = {
+                    "docx": None,
+                    "error": chunk_errors.get(
+                        input_path, "LibreOffice gagal mengkonversi file."),
+                }
+
+    return {filename: results[filename] for filename in files}
 
 
 def is_doc_file(filename: str) -> bool:
@@ -74,7 +496,7 @@ def is_doc_file(filename: str) -> bool:
     return filename.lower().endswith(".doc") and not filename.lower().endswith(".docx")
 
 
-def ensure_docx_bytes(file_bytes: bytes, filename: str) -> tuple[bytes, str]:
+def ensure_docx_bytes(file_bytes: bytes, filename: str, timeout: float = None) -> tuple[bytes, str]:
     """
     Pastikan file dalam format .docx.
     Jika .doc, otomatis konversi dulu.
@@ -83,7 +505,8 @@ def ensure_docx_bytes(file_bytes: bytes, filename: str) -> tuple[bytes, str]:
         tuple (docx_bytes, docx_filename)
     """
     if is_doc_file(filename):
-        docx_bytes = convert_doc_to_docx(file_bytes, filename)
+        with instrumentation.span("ensure_docx_bytes"):
+            docx_bytes = convert_doc_to_docx(file_bytes, filename, timeout=timeout)
         docx_filename = os.path.splitext(filename)[0] + ".docx"
         return docx_bytes, docx_filename
     return file_bytes, filename
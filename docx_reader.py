@@ -0,0 +1,103 @@
+# docx_reader.py
+import posixpath
+import zipfile
+from io import BytesIO
+
+from lxml import etree
+
+_W = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+_W_BODY = _W + "body"
+_W_P = _W + "p"
+_W_BR = _W + "br"
+_W_TYPE = _W + "type"
+_R_OFFICE_DOCUMENT = (
+    "http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument")
+_PKG_RELATIONSHIP = (
+    "{http://schemas.openxmlformats.org/package/2006/relationships}Relationship")
+
+# Sama dengan CT_P.text / CT_R.text python-docx: hanya anak langsung w:r
+# (termasuk w:r di dalam w:hyperlink) yang menyumbang teks
+_RUN_CONTENT = etree.XPath(
+    "w:r/*|w:hyperlink/w:r/*", namespaces={"w": _W[1:-1]})
+_RUN_TEXT = {
+    _W + "t": None,
+    _W + "tab": "\t",
+    _W + "ptab": "\t",
+    _W + "cr": "\n",
+    _W + "noBreakHyphen": "-",
+}
+
+
+def _main_part_name(zf):
+    # Lokasi document.xml diambil dari _rels/.rels, bukan ditebak
+    try:
+        root = etree.fromstring(zf.read("_rels/.rels"))
+    except KeyError:
+        return "word/document.xml"
+    for rel in root.iter(_PKG_RELATIONSHIP):
+        if rel.get("Type") == _R_OFFICE_DOCUMENT:
+            return posixpath.normpath(rel.get("Target").lstrip("/"))
+    return "word/document.xml"
+
+
+def _paragraph_text(p):
+    parts = []
+    for el in _RUN_CONTENT(p):
+        if el.tag in _RUN_TEXT:
+            text = _RUN_TEXT[el.tag]
+            parts.append((el.text or "") if text is None else text)
+        elif el.tag == _W_BR and el.get(_W_TYPE, "textWrapping") == "textWrapping":
+            parts.append("\n")
+    return "".join(parts)
+
+
+def iter_paragraph_texts(source):
+    """
+    Teks setiap paragraf body dokumen .docx, dibaca bertahap dari
+    word/document.xml tanpa membangun python-docx Document.
+
+    Hasilnya sama dengan `[p.text for p in Document(source).paragraphs]`
+    (paragraf kosong ikut, paragraf di dalam tabel tidak), tetapi elemen
+    yang sudah dibaca langsung dibuang sehingga memori tidak tergantung
+    besar dokumen. Styles, numbering, header dan gambar tidak dibaca.
+
+    Args:
+        source: bytes .docx, path, atau file-like object
+
+    Yields:
+        str teks paragraf
+
+    Raises:
+        RuntimeError: jika file bukan .docx yang valid
+    """
+    if isinstance(source, (bytes, bytearray)):
+        source = BytesIO(source)
+    try:
+        with zipfile.ZipFile(source) as zf, zf.open(_main_part_name(zf)) as f:
+            context = etree.iterparse(
+                f, events=("end",), remove_blank_text=True,
+                resolve_entities=False, no_network=True)
+            for _, el in context:
+                parent = el.getparent()
+                if parent is None or parent.tag != _W_BODY:
+                    continue
+                if el.tag == _W_P:
+                    yield _paragraph_text(el)
+                # Anak body yang sudah selesai (paragraf, tabel, dst.) dibuang
+                el.clear()
+                while el.getprevious() is not None:
+                    del parent[0]
+    except (zipfile.BadZipFile, KeyError, etree.XMLSyntaxError) as e:
+        raise RuntimeError(f"File .docx tidak valid: {e}") from e
+
+
+def read_paragraph_texts(source):
+    """List teks semua paragraf body, lihat `iter_paragraph_texts`."""
+    return list(iter_paragraph_texts(source))
+
+
+if __name__ == "__main__":
+    import sys
+
+    for text in iter_paragraph_texts(sys.argv[1]):
+        print(text)
@@ -3,7 +3,13 @@ import streamlit as st
 from docx import Document
 from pptx import Presentation
 from io import BytesIO
+import os
 import re
+import sys
+
+# ppt.py memakai slide_renderer di folder root repo
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
 from cover import extract_cover
 from isi import extract_isi
 from ppt import generate_slides
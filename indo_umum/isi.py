@@ -1,17 +1,24 @@
 # isi.py
-import streamlit as st
-from docx import Document
+import os
 import re
+import sys
 
+if __name__ == "__main__":
+    # Dijalankan sendiri (streamlit run isi.py): modul bersama ada di root repo
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-def extract_isi(doc):
-    paragraphs = [re.sub(r'\s+', ' ', p.text).strip()
-                  for p in doc.paragraphs if p.text.strip()]
+from keyword_matcher import KeywordMatcher
+from doc_analysis import analyze
+
+# Keyword pembuka section, dikompilasi sekali saat import
+KEYWORDS_ACARA = KeywordMatcher([
+    "BERNYANYI", "VOTUM", "HUKUM", "DOA", "EPISTEL", "E P I S T E L",
+    "PENGAKUAN IMAN", "WARTA", "K O O R", "KOOR", "KHOTBAH", "K H O T B A H"
+])
 
-    keywords_acara = [
-        "BERNYANYI", "VOTUM", "HUKUM", "DOA", "EPISTEL", "E P I S T E L",
-        "PENGAKUAN IMAN", "WARTA", "K O O R", "KOOR", "KHOTBAH", "K H O T B A H"
-    ]
+
+def extract_isi(doc):
+    analysis = analyze(doc)
 
     re_nomor = re.compile(r"^\s*(\d{1,2})[\.\s:]+(.*)", re.IGNORECASE)
     re_koor = re.compile(r"K\s*O\s*O\s*R", re.IGNORECASE)
@@ -25,12 +32,10 @@ def extract_isi(doc):
     current_section = None
     counter_id = 1
 
-    for text in paragraphs:
+    for text, text_upper, normalized_text in analysis.lines():
         match_num = re_nomor.match(text)
-        normalized_text = text.upper().replace(" ", "")
 
-        is_keyword = any(normalized_text.startswith(
-            k.replace(" ", "")) for k in keywords_acara)
+        is_keyword = KEYWORDS_ACARA.match(normalized_text) is not None
 
         if is_keyword and len(text) > 60 and not match_num:
             is_keyword = False
@@ -69,12 +74,12 @@ def extract_isi(doc):
                         }
                         counter_id += 1
                     # Jika ada tanda pemisah waktu/jadwal, masukkan ke judul KOOR
-                    elif "-" in text or "PKL" in text.upper():
+                    elif "-" in text or "PKL" in text_upper:
                         current_section["header_lines"].append(text)
                     else:
                         current_section["content_lines"].append(text)
                 # Jika section biasa tapi ada kata BERNYANYI/KHOTBAH muncul mendadak
-                elif "BERNYANYI" in text.upper() or "KHOTBAH" in text.upper().replace(" ", ""):
+                elif "BERNYANYI" in text_upper or "KHOTBAH" in normalized_text:
                     sections.append(current_section)
                     current_section = {
                         "nomor": counter_id,
@@ -103,6 +108,9 @@ def extract_isi(doc):
 
 
 if __name__ == "__main__":
+    import streamlit as st
+    from docx import Document
+
     st.title("Ekstraksi Detail Acara")
     uploaded_file = st.file_uploader("Upload file DOCX", type=["docx"])
 
@@ -0,0 +1,251 @@
+# instrumentation.py
+#
+# Pencatat waktu per tahap pembuatan deck (konversi, parsing, render,
+# background, warta, simpan). Satu "trace" mewakili satu pekerjaan
+# (misalnya satu kali klik Proses Dokumen); di dalamnya setiap `span`
+# dijumlahkan per nama tahap, bukan disimpan satu per satu, supaya
+# apply_background yang dipanggil ratusan kali tetap murah.
+#
+#   with instrumentation.trace("generate", format=fmt):
+#       with instrumentation.span("extract_isi"):
+#           ...
+#       instrumentation.count("slides", 42)
+#
+#   python instrumentation.py trace.jsonl     # ringkasan file JSONL
+
+import contextvars
+import json
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from collections import deque
+from contextlib import contextmanager
+from datetime import datetime
+
+# Setiap trace yang selesai ditambahkan sebagai satu baris JSON ke file ini
+TRACE_FILE = os.getenv("SLIDENAULI_TRACE_FILE")
+# Catat peak memory per tahap dengan tracemalloc (memperlambat, dan
+# hanya alokasi Python; angka tidak akurat jika beberapa trace berjalan
+# bersamaan karena tracemalloc berlaku untuk seluruh proses)
+TRACE_MEMORY = os.getenv("SLIDENAULI_TRACE_MEMORY", "0") == "1"
+# Tampilkan panel debug di app.py
+DEBUG_PANEL = os.getenv("SLIDENAULI_DEBUG", "0") == "1"
+RECENT_TRACES = 50
+
+_current = contextvars.ContextVar("slidenauli_trace", default=None)
+_lock = threading.Lock()
+# Total seluruh proses, termasuk span di luar trace
+_totals = {}
+_counters = {}
+_recent = deque(maxlen=RECENT_TRACES)
+
+
+class Stage:
+    """Akumulasi semua span dengan nama yang sama."""
+
+    __slots__ = ("count", "seconds", "max_seconds", "peak_bytes")
+
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0.0
+        self.max_seconds = 0.0
+        self.peak_bytes = None
+
+    def add(self, seconds, peak_bytes=None):
+        self.count += 1
+        self.seconds += seconds
+        self.max_seconds = max(self.max_seconds, seconds)
+        if peak_bytes is not None:
+            self.peak_bytes = max(self.peak_bytes or 0, peak_bytes)
+
+    def as_dict(self):
+        d = {"count": self.count, "seconds": round(self.seconds, 6),
+             "max_seconds": round(self.max_seconds, 6)}
+        if self.peak_bytes is not None:
+            d["peak_bytes"] = self.peak_bytes
+        return d
+
+
+class Trace:
+    """Tahap dan counter satu pekerjaan, lihat `trace()`."""
+
+    def __init__(self, name, **attrs):
+        self.name = name
+        self.attrs = attrs
+        self.started = time.time()
+        self.seconds = None
+        self.stages = {}
+        self.counters = {}
+        # Span yang sedang terbuka: [memori saat mulai, peak sejauh ini]
+        self._memory_stack = []
+
+    def as_dict(self):
+        return {
+            "trace": self.name,
+            "time": datetime.fromtimestamp(self.started).isoformat(timespec="seconds"),
+            "seconds": None if self.seconds is None else round(self.seconds, 6),
+            **self.attrs,
+            "stages": {name: stage.as_dict() for name, stage in self.stages.items()},
+            "counters": dict(self.counters),
+        }
+
+
+def current():
+    """Trace yang sedang aktif di thread/context ini, atau None."""
+    return _current.get()
+
+
+@contextmanager
+def trace(name, **attrs):
+    """
+    Mulai trace baru; semua span dan counter di dalam blok masuk ke trace
+    ini. Setelah selesai trace disimpan di `recent_traces()` dan ditulis
+    ke TRACE_FILE (jika diatur).
+
+    Args:
+        name: nama pekerjaan, misalnya "generate" atau "build"
+        attrs: keterangan tambahan (format, mode, ...) yang ikut diekspor
+
+    Yields:
+        Trace
+    """
+    t = Trace(name, **attrs)
+    token = _current.set(t)
+    started_memory = TRACE_MEMORY and not tracemalloc.is_tracing()
+    if started_memory:
+        tracemalloc.start()
+    t0 = time.perf_counter()
+    try:
+        yield t
+    except BaseException as e:
+        t.attrs["error"] = type(e).__name__
+        raise
+    finally:
+        t.seconds = time.perf_counter() - t0
+        _current.reset(token)
+        if started_memory:
+            tracemalloc.stop()
+        _finish(t)
+
+
+@contextmanager
+def span(name):
+    """Ukur satu tahap; dipanggil berulang dengan nama sama akan dijumlahkan."""
+    t = _current.get()
+    stack = None
+    if t is not None and TRACE_MEMORY and tracemalloc.is_tracing():
+        stack = t._memory_stack
+        current_bytes, peak = tracemalloc.get_traced_memory()
+        if stack:
+            # Peak sebelum span ini milik span induk
+            stack[-1][1] = max(stack[-1][1], peak)
+        tracemalloc.reset_peak()
+        stack.append([current_bytes, current_bytes])
+
+    t0 = time.perf_counter()
+    try:
+        yield
+    finally:
+        seconds = time.perf_counter() - t0
+        peak_bytes = None
+        if stack is not None:
+            start_bytes, peak = stack.pop()
+            peak = max(peak, tracemalloc.get_traced_memory()[1])
+            if stack:
+                stack[-1][1] = max(stack[-1][1], peak)
+            peak_bytes = peak - start_bytes
+        if t is not None:
+            t.stages.setdefault(name, Stage()).add(seconds, peak_bytes)
+        with _lock:
+            _totals.setdefault(name, Stage()).add(seconds, peak_bytes)
+
+
+def count(name, n=1):
+    """Tambah counter (jumlah slide, bytes, cache hit, ...)."""
+    t = _current.get()
+    if t is not None:
+        t.counters[name] = t.counters.get(name, 0) + n
+    with _lock:
+        _counters[name] = _counters.get(name, 0) + n
+
+
+def _finish(t):
+    with _lock:
+        _recent.append(t)
+    if TRACE_FILE:
+        try:
+            export_jsonl(TRACE_FILE, [t])
+        except OSError:
+            # Gagal menulis log tidak boleh menggagalkan pembuatan slide
+            pass
+
+
+def recent_traces():
+    """Trace yang sudah selesai di proses ini (paling lama dulu)."""
+    with _lock:
+        return list(_recent)
+
+
+def totals():
+    """
+    Total seluruh proses sejak dimulai.
+
+    Returns:
+        (dict nama tahap -> Stage.as_dict(), dict counter)
+    """
+    with _lock:
+        return ({name: stage.as_dict() for name, stage in _totals.items()},
+                dict(_counters))
+
+
+def to_jsonl(traces):
+    """Teks JSON lines dari Trace (atau dict hasil `Trace.as_dict()`)."""
+    return "".join(
+        json.dumps(t.as_dict() if isinstance(t, Trace) else t,
+                   ensure_ascii=False, default=str) + "\n"
+        for t in traces)
+
+
+def export_jsonl(path, traces=None):
+    """Tambahkan `traces` (default `recent_traces()`) ke file JSON lines."""
+    data = to_jsonl(recent_traces() if traces is None else traces)
+    with _lock, open(path, "a", encoding="utf-8") as f:
+        f.write(data)
+
+
+def format_stages(stages):
+    """Tabel teks dari dict tahap (hasil `Trace.as_dict()["stages"]`)."""
+    if not stages:
+        return "Belum ada tahap yang tercatat."
+    width = max(len(name) for name in stages)
+    lines = [f"{'tahap':<{width}}  {'n':>5}  {'total ms':>10}  {'maks ms':>9}  {'peak MB':>8}"]
+    for name, s in sorted(stages.items(), key=lambda item: -item[1]["seconds"]):
+        peak = s.get("peak_bytes")
+        peak_text = f"{peak / 1e6:8.1f}" if peak is not None else f"{'-':>8}"
+        lines.append(f"{name:<{width}}  {s['count']:>5}  {s['seconds'] * 1000:>10.1f}  "
+                     f"{s['max_seconds'] * 1000:>9.1f}  {peak_text}")
+    return "\n".join(lines)
+
+
+def _merge_stages(records):
+    merged = {}
+    for record in records:
+        for name, s in record.get("stages", {}).items():
+            m = merged.setdefault(name, {"count": 0, "seconds": 0.0, "max_seconds": 0.0})
+            m["count"] += s["count"]
+            m["seconds"] += s["seconds"]
+            m["max_seconds"] = max(m["max_seconds"], s["max_seconds"])
+            if "peak_bytes" in s:
+                m["peak_bytes"] = max(m.get("peak_bytes", 0), s["peak_bytes"])
+    return merged
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 2:
+        sys.exit("Pemakaian: python instrumentation.py trace.jsonl")
+    with open(sys.argv[1], encoding="utf-8") as f:
+        records = [json.loads(line) for line in f if line.strip()]
+    print(f"{len(records)} trace")
+    print(format_stages(_merge_stages(records)))
@@ -0,0 +1,35 @@
+# keyword_matcher.py
+import re
+
+
+def normalize(text):
+    """Huruf besar tanpa spasi, bentuk teks yang dipakai untuk mencocokkan keyword."""
+    return text.upper().replace(" ", "")
+
+
+class KeywordMatcher:
+    """
+    Daftar keyword yang dikompilasi sekali menjadi satu regex alternation.
+
+    Keyword dinormalisasi (huruf besar, tanpa spasi) saat dibuat dan
+    diurutkan dari yang terpanjang, sehingga satu kali pencocokan per
+    paragraf langsung menghasilkan keyword paling spesifik yang cocok.
+    Teks yang diperiksa harus sudah dinormalisasi dengan `normalize()`.
+    """
+
+    def __init__(self, keywords):
+        self.keywords = tuple(sorted({normalize(k) for k in keywords},
+                                     key=lambda k: (-len(k), k)))
+        pattern = "|".join(re.escape(k) for k in self.keywords)
+        # Tanpa keyword, regex kosong akan cocok dengan semua teks
+        self._regex = re.compile(pattern or r"(?!)")
+
+    def match(self, normalized_text):
+        """Keyword di awal teks, atau None."""
+        m = self._regex.match(normalized_text)
+        return m.group(0) if m else None
+
+    def search(self, normalized_text):
+        """Keyword pertama yang muncul di mana saja dalam teks, atau None."""
+        m = self._regex.search(normalized_text)
+        return m.group(0) if m else None
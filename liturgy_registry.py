@@ -0,0 +1,117 @@
+# liturgy_registry.py
+import importlib
+import sys
+import threading
+import time
+
+# Format -> nama entry point -> modul. Modul baru di-import saat format
+# tersebut pertama kali dipakai, bukan saat app dimulai.
+#   cover      : extract_cover(doc)
+#   isi        : extract_isi(doc)
+#   ppt        : generate_slides(...) mode Projector
+#   ppt_stream : generate_slides(...) mode YouTube
+LITURGIES = {
+    "Ibadah Indonesia Umum": {
+        "cover": "indo_umum.cover",
+        "isi": "indo_umum.isi",
+        "ppt": "indo_umum.ppt",
+        "ppt_stream": "indo_umum.ppt_stream",
+    },
+    "Ibadah Batak Umum": {
+        "cover": "batak_umum.cover",
+        "isi": "batak_umum.isi",
+        "ppt": "batak_umum.ppt",
+        "ppt_stream": "batak_umum.ppt_stream",
+    },
+    "Ibadah Remaja": {
+        "cover": "remaja.cover",
+        "isi": "remaja.isi",
+        "ppt": "remaja.ppt",
+    },
+    "Ibadah Sore": {
+        "cover": "sore.cover",
+        "isi": "sore.isi",
+        "ppt": "sore.ppt",
+    },
+    "Sekolah Minggu (SKM)": {
+        "cover": "skm.cover",
+        "isi": "skm.isi",
+        "ppt": "skm.ppt",
+    },
+}
+
+_lock = threading.Lock()
+# nama modul -> detik import (termasuk dependensi yang baru ter-import)
+_import_times = {}
+
+
+def formats():
+    """Nama semua format yang terdaftar."""
+    return list(LITURGIES)
+
+
+def has_entry_point(fmt, entry_point):
+    return entry_point in LITURGIES.get(fmt, {})
+
+
+def load(fmt, entry_point):
+    """
+    Modul `entry_point` untuk format `fmt`, di-import saat pertama dipakai.
+
+    Args:
+        fmt: nama format, misalnya "Ibadah Batak Umum"
+        entry_point: "cover", "isi", "ppt" atau "ppt_stream"
+
+    Returns:
+        module
+
+    Raises:
+        RuntimeError: jika format atau entry point tidak terdaftar
+    """
+    try:
+        name = LITURGIES[fmt][entry_point]
+    except KeyError:
+        raise RuntimeError(
+            f"Format '{fmt}' tidak punya modul '{entry_point}'") from None
+
+    module = sys.modules.get(name)
+    if module is not None:
+        return module
+
+    with _lock:
+        start = time.perf_counter()
+        module = importlib.import_module(name)
+        _import_times.setdefault(name, time.perf_counter() - start)
+    return module
+
+
+def preload(fmt=None):
+    """Import semua modul satu format (atau semua format jika None)."""
+    for name in ([fmt] if fmt else formats()):
+        for entry_point in LITURGIES[name]:
+            load(name, entry_point)
+
+
+def import_report():
+    """
+    Daftar (nama modul, detik) untuk modul yang di-import lewat registry,
+    urut sesuai waktu import.
+    """
+    with _lock:
+        return list(_import_times.items())
+
+
+def format_import_report():
+    report = import_report()
+    if not report:
+        return "Belum ada modul liturgi yang di-import."
+    width = max(len(name) for name, _ in report)
+    lines = [f"{name:<{width}}  {seconds * 1000:8.1f} ms" for name, seconds in report]
+    total = sum(seconds for _, seconds in report)
+    lines.append(f"{'total':<{width}}  {total * 1000:8.1f} ms")
+    return "\n".join(lines)
+
+
+if __name__ == "__main__":
+    preload()
+    print(format_import_report())
@@ -2,39 +2,144 @@
 
 import re
 import os
+import json
 import random
+from copy import deepcopy
 from io import BytesIO
+from itertools import islice
 from pptx import Presentation
 from pptx.dml.color import RGBColor
 from pptx.enum.shapes import MSO_SHAPE
+from pptx.opc.constants import CONTENT_TYPE as CT
+from pptx.opc.constants import RELATIONSHIP_TYPE as RT
+from pptx.oxml import parse_xml
+from pptx.oxml.ns import nsdecls, qn
+from pptx.parts.slide import SlideLayoutPart
 from lxml import etree
 import warta.warta_normal as warta_normal
 import warta.warta_wide as warta_wide
+import backgrounds
+import pptx_writer
+import parallel_render
+import section_cache
+import docx_reader
+import instrumentation
+from disk_cache import sha256_hex
+from doc_analysis import analyze
+
+# Cara memasang background, lihat build_slides
+BG_MODES = ("shared", "slide", "layout")
+
+# Cara menulis file hasil: "stream" (per section) atau "pptx" (prs.save)
+PPTX_WRITER = os.getenv("SLIDENAULI_PPTX_WRITER", "stream")
+
+
+# Jumlah paragraf awal dokumen yang dipakai untuk deteksi format
+DETECT_PARAGRAPHS = 20
+
+# Aturan deteksi sesuai prioritas: format pertama yang setiap kelompok
+# keyword-nya muncul (minimal satu keyword per kelompok) yang dipakai
+FORMAT_RULES = [
+    ("Warta Remaja", (("warta",), ("remaja", "naposobulung"))),
+    ("Warta Jemaat", (("warta",),)),
+    ("Sekolah Minggu (SKM)", (("sekolah minggu", "skm"),)),
+    ("Ibadah Sore", (("sore", "pukul 17", "pukul 18"),)),
+    ("Ibadah Remaja", (("remaja", "naposobulung"),)),
+    ("Ibadah Batak Umum", (("agenda", "parmingguon", "pukul 07", "pukul 09"),)),
+    ("Ibadah Indonesia Umum", (("tata ibadah", "pukul 10"),)),
+]
+_FORMAT_KEYWORDS = {k for _, groups in FORMAT_RULES for group in groups for k in group}
+# Muncul di judul hampir semua tata ibadah (Sore, Remaja, ...), jadi tidak
+# dihitung sebagai bukti untuk atau melawan format mana pun di confidence
+GENERIC_KEYWORDS = {"tata ibadah"}
+# Confidence jika yang cocok hanya keyword umum
+GENERIC_CONFIDENCE = 0.5
+
+
+def classify_format(head_texts):
+    """
+    Format dokumen dari teks paragraf awalnya.
+
+    Args:
+        head_texts: teks paragraf awal dokumen (biasanya DETECT_PARAGRAPHS
+            paragraf pertama)
+
+    Returns:
+        (format, confidence): confidence 0..1 adalah porsi keyword pembeda
+        (di luar GENERIC_KEYWORDS) yang ditemukan yang memang milik format
+        terpilih; GENERIC_CONFIDENCE jika hanya keyword umum yang cocok,
+        0.0 untuk "Unknown"
+    """
+    full_text = "\n".join(head_texts).lower()
+    found = {k for k in _FORMAT_KEYWORDS if k in full_text}
+    distinct = found - GENERIC_KEYWORDS
+    for fmt, groups in FORMAT_RULES:
+        if all(any(k in found for k in group) for group in groups):
+            own = {k for group in groups for k in group if k in distinct}
+            if not own:
+                return fmt, GENERIC_CONFIDENCE
+            return fmt, round(len(own) / len(distinct), 2)
+    return "Unknown", 0.0
 
 
 def detect_format(doc):
-    full_text = "\n".join([p.text for p in doc.paragraphs[:20]]).lower()
-    if "warta" in full_text:
-        if any(x in full_text for x in ["remaja", "naposobulung"]):
-            return "Warta Remaja"
-        return "Warta Jemaat"
-    elif "sekolah minggu" in full_text or "skm" in full_text:
-        return "Sekolah Minggu (SKM)"
-    elif any(x in full_text for x in ["sore", "pukul 17", "pukul 18"]):
-        return "Ibadah Sore"
-    elif any(x in full_text for x in ["remaja", "naposobulung"]):
-        return "Ibadah Remaja"
-    elif any(x in full_text for x in ["agenda", "parmingguon", "pukul 07", "pukul 09"]):
-        return "Ibadah Batak Umum"
-    elif any(x in full_text for x in ["tata ibadah", "pukul 10"]):
-        return "Ibadah Indonesia Umum"
-    return "Unknown"
-
-
-def apply_background(prs, slide, bg_path):
-    if bg_path and os.path.exists(bg_path):
-        pic = slide.shapes.add_picture(
-            bg_path, 0, 0, width=prs.slide_width, height=prs.slide_height)
+    with instrumentation.span("detect_format"):
+        return classify_format(analyze(doc).texts[:DETECT_PARAGRAPHS])[0]
+
+
+def detect_format_bytes(data):
+    """
+    Deteksi format langsung dari bytes .docx. Hanya paragraf awal yang
+    dibaca; sisa dokumen (termasuk gambar) tidak pernah di-parse.
+
+    Returns:
+        (format, confidence), lihat `classify_format`
+
+    Raises:
+        RuntimeError: jika bytes bukan .docx yang valid
+    """
+    with instrumentation.span("detect_format"):
+        paragraphs = docx_reader.iter_paragraph_texts(data)
+        try:
+            head = list(islice(paragraphs, DETECT_PARAGRAPHS))
+        finally:
+            paragraphs.close()
+        return classify_format(head)
+
+
+def apply_background(prs, slide, bg_path, bake_overlay=True, image_parts=None):
+    """
+    Pasang background di belakang isi slide.
+
+    Jika `image_parts` (dict per deck) diberikan, image part untuk tiap
+    background hanya dibuat sekali dan slide berikutnya cukup menambah
+    relationship ke part yang sama, tanpa membaca dan meng-hash gambar
+    ulang seperti `add_picture`.
+    """
+    if not bg_path:
+        return
+    # Pakai versi yang sudah diperkecil (dan digelapkan) dari registry
+    aspect = backgrounds.aspect_key(prs.slide_width, prs.slide_height)
+    bg = backgrounds.registry.get(bg_path, aspect, bake_overlay)
+    if bg is not None:
+        if image_parts is None:
+            pic = slide.shapes.add_picture(
+                BytesIO(bg.blob), 0, 0, width=prs.slide_width, height=prs.slide_height)._element
+        else:
+            image_part = image_parts.get(bg.sha1)
+            if image_part is None:
+                image_part = prs.part.package.get_or_add_image_part(
+                    BytesIO(bg.blob))
+                image_parts[bg.sha1] = image_part
+            rId = slide.part.relate_to(image_part, RT.IMAGE)
+            pic = slide.shapes._add_pic_from_image_part(
+                image_part, rId, 0, 0, prs.slide_width, prs.slide_height)
+        slide.shapes._spTree.remove(pic)
+        slide.shapes._spTree.insert(2, pic)
+
+        if bake_overlay:
+            return
+
         overlay = slide.shapes.add_shape(
             MSO_SHAPE.RECTANGLE, 0, 0, width=prs.slide_width, height=prs.slide_height)
         overlay.fill.solid()
@@ -47,12 +152,65 @@ def apply_background(prs, slide, bg_path):
             srgbClr, '{http://schemas.openxmlformats.org/drawingml/2006/main}alpha', val='30000')
 
         overlay.line.fill.background()
-        slide.shapes._spTree.remove(pic._element)
-        slide.shapes._spTree.insert(2, pic._element)
         slide.shapes._spTree.remove(overlay._element)
         slide.shapes._spTree.insert(3, overlay._element)
 
 
+def add_background_layout(prs, bg_path):
+    """
+    Buat slide layout "Background" (salinan layout Blank) dengan gambar
+    background yang sudah digelapkan sebagai <p:bg>. Slide yang memakai
+    layout ini tidak perlu shape gambar/overlay sendiri, sedangkan slide
+    yang punya background sendiri (misal warta) tetap tidak terpengaruh.
+
+    Returns:
+        SlideLayout baru, atau None jika background tidak tersedia
+    """
+    aspect = backgrounds.aspect_key(prs.slide_width, prs.slide_height)
+    bg = backgrounds.registry.get(bg_path, aspect, True)
+    if bg is None:
+        return None
+
+    master = prs.slide_master
+    package = master.part.package
+    partname = package.next_partname("/ppt/slideLayouts/slideLayout%d.xml")
+
+    element = deepcopy(prs.slide_layouts[6]._element)
+    cSld = element.find(qn("p:cSld"))
+    cSld.set("name", "Background")
+    old_bg = cSld.find(qn("p:bg"))
+    if old_bg is not None:
+        cSld.remove(old_bg)
+
+    layout_part = SlideLayoutPart(
+        partname, CT.PML_SLIDE_LAYOUT, package, element)
+    layout_part.relate_to(master.part, RT.SLIDE_MASTER)
+    image_part = package.get_or_add_image_part(BytesIO(bg.blob))
+    rId_img = layout_part.relate_to(image_part, RT.IMAGE)
+    cSld.insert(0, parse_xml(
+        f'<p:bg {nsdecls("p", "a", "r")}><p:bgPr>'
+        f'<a:blipFill dpi="0" rotWithShape="1"><a:blip r:embed="{rId_img}"/>'
+        f'<a:srcRect/><a:stretch><a:fillRect/></a:stretch></a:blipFill>'
+        f'<a:effectLst/></p:bgPr></p:bg>'))
+
+    rId = master.part.relate_to(layout_part, RT.SLIDE_LAYOUT)
+    ids = [int(e.get("id")) for e in prs.part._element.xpath("//p:sldMasterId")]
+    ids += [int(e.get("id"))
+            for e in master._element.xpath("//p:sldLayoutId")]
+    entry = master._element.get_or_add_sldLayoutIdLst()._add_sldLayoutId()
+    entry.set("id", str(max(ids) + 1))
+    entry.set(qn("r:id"), rId)
+
+    return prs.slide_layouts[-1]
+
+
+def use_layout(slide, layout):
+    # Arahkan relationship layout slide ke layout lain tanpa membuat ulang slide
+    for rel in slide.part.rels.values():
+        if rel.reltype == RT.SLIDE_LAYOUT:
+            rel._target = layout.part
+
+
 def set_font_white(slide):
     for shape in slide.shapes:
         if shape.has_text_frame:
@@ -61,51 +219,211 @@ def set_font_white(slide):
                     run.font.color.rgb = RGBColor(255, 255, 255)
 
 
-def merge_and_generate(warta_doc, cover_info, data_isi, gen_slides_func, warta_mode):
-    prs = Presentation()
+def deck_seed(cover_info, data_isi):
+    """Seed bawaan satu deck: hash isi dokumen dan tanggal ibadah."""
+    payload = {
+        "cover": {k: cover_info.get(k) for k in ("minggu", "topik", "tanggal")},
+        "isi": data_isi,
+    }
+    return sha256_hex(json.dumps(payload, sort_keys=True, default=str).encode())
+
+
+def _resolve_bg_map(bg_map):
+    # Kunci "cover" atau indeks section (int / string angka dari JSON);
+    # nama file relatif dicari di folder pics/
+    resolved = {}
+    for key, path in (bg_map or {}).items():
+        if key != "cover":
+            try:
+                key = int(key)
+            except (TypeError, ValueError):
+                raise RuntimeError(f"Kunci bg_map tidak valid: {key!r}") from None
+        if path and not os.path.isabs(path):
+            path = os.path.join(backgrounds.BG_FOLDER, path)
+        resolved[key] = path
+    return resolved
+
+
+# Judul section yang diikuti slide warta
+WARTA_KEYWORDS = ["WARTA", "TINGTING", "TING TING", "TING-TING"]
+
+
+def is_warta_section(section):
+    judul = section.get('judul', '').upper()
+    return any(kw in judul for kw in WARTA_KEYWORDS)
+
+
+def build_slides(prs, warta_doc, cover_info, data_isi, gen_slides_func, warta_mode,
+                 workers=None, seed=None, bg_map=None):
+    """
+    Isi `prs` dengan slide cover lalu slide per section.
+
+    Generator ini yield setiap kali satu kelompok slide (cover, atau satu
+    section beserta warta-nya) selesai dibuat dan diberi background,
+    sehingga pemanggil bisa langsung menulis slide tersebut ke file.
+
+    Dengan `workers` > 1 (default SLIDENAULI_RENDER_WORKERS), slide setiap
+    section dirender paralel di process pool lalu disisipkan ke `prs`
+    sesuai urutan; background dan warta tetap dipasang di proses ini.
+
+    Background dipilih dengan RNG per deck dari `seed` (default
+    `deck_seed`), jadi input yang sama selalu menghasilkan deck yang sama.
+    `bg_map` ({"cover": path, indeks section: path}) memaksa background
+    tertentu; slot lain tetap memakai RNG dengan urutan yang sama.
+    """
+    rng = random.Random(deck_seed(cover_info, data_isi) if seed is None else seed)
+    bg_map = _resolve_bg_map(bg_map)
     use_bg = cover_info.get("use_bg", False)
+    bake_overlay = cover_info.get("bg_bake_overlay", True)
+    # "shared": satu image part per background untuk seluruh deck,
+    # "slide": add_picture biasa di setiap slide,
+    # "layout": satu background untuk semua slide, dipasang di slide layout
+    bg_mode = cover_info.get("bg_mode", "shared")
+    if bg_mode not in BG_MODES:
+        raise RuntimeError(f"bg_mode tidak dikenal: {bg_mode!r}")
+    image_parts = {} if bg_mode == "shared" else None
     bg_files = []
+    bg_layout = None
 
     if use_bg:
-        bg_folder = "pics"
-        if os.path.exists(bg_folder):
-            bg_files = [os.path.join(bg_folder, f) for f in os.listdir(
-                bg_folder) if f.lower().endswith(('.png', '.jpg', '.jpeg'))]
-
-    target_kws = ["WARTA", "TINGTING", "TING TING", "TING-TING"]
+        bg_files = backgrounds.registry.files()
 
-    gen_slides_func(prs, cover_info, [])
+    with instrumentation.span("gen_slides"):
+        gen_slides_func(prs, cover_info, [])
 
     if use_bg and bg_files:
-        bg_main = random.choice(bg_files)
-        apply_background(prs, prs.slides[0], bg_main)
-        set_font_white(prs.slides[0])
+        bg_main = bg_map.get("cover", rng.choice(bg_files))
+        with instrumentation.span("apply_background"):
+            if bg_mode == "layout":
+                bg_layout = add_background_layout(prs, bg_main)
+                if bg_layout is not None:
+                    use_layout(prs.slides[0], bg_layout)
+                    set_font_white(prs.slides[0])
+                    # Teks section langsung dibuat putih oleh modul ppt,
+                    # tanpa set_font_white; hanya jika layout-nya ada
+                    cover_info["text_color"] = RGBColor(255, 255, 255)
+            else:
+                apply_background(prs, prs.slides[0], bg_main,
+                                 bake_overlay, image_parts)
+                set_font_white(prs.slides[0])
+
+    yield
 
-    for section in data_isi:
-        judul = section.get('judul', '').upper()
-        is_warta_section = any(kw in judul for kw in target_kws)
+    # Section yang isinya tidak berubah sejak render sebelumnya diambil
+    # dari section_cache; hanya sisanya yang dirender (paralel jika bisa).
+    # Warta mengubah ukuran slide (warta_wide ke 16:9, warta_normal ke
+    # 4:3), jadi hanya section sampai warta pertama yang dikirim ke worker
+    # dengan `slide_size`; sisanya dirender di proses ini dan kunci
+    # cache-nya memakai ukuran slide saat section itu dirender.
+    slide_size = (prs.slide_width, prs.slide_height)
+    token = section_cache.renderer_token(
+        gen_slides_func) if section_cache.SECTION_CACHE else None
+    n_parallel = len(data_isi)
+    if warta_doc:
+        n_parallel = next((i + 1 for i, section in enumerate(data_isi)
+                           if is_warta_section(section)), n_parallel)
+    keys = [section_cache.section_key(token, cover_info, section, slide_size)
+            if token else None for section in data_isi[:n_parallel]]
+    cached = [section_cache.get(key) if key else None for key in keys]
+    instrumentation.count("sections", len(data_isi))
+    rendered = parallel_render.render_sections(
+        gen_slides_func, cover_info,
+        [section for section, hit in zip(data_isi, cached) if hit is None],
+        slide_size, workers)
 
+    for index, section in enumerate(data_isi):
         start_idx = len(prs.slides)
+        current_size = (prs.slide_width, prs.slide_height)
+
+        if index < n_parallel:
+            key, hit = keys[index], cached[index]
+        else:
+            key = section_cache.section_key(
+                token, cover_info, section, current_size) if token else None
+            hit = section_cache.get(key) if key else None
+        if hit is not None:
+            instrumentation.count("section_cache_hits")
 
         cover_info['skip_cover'] = True
-        gen_slides_func(prs, cover_info, [section])
+        result = hit
+        if result is None and rendered is not None and index < n_parallel:
+            result = next(rendered)
+        if result is not None and tuple(result[0]) != current_size:
+            # Dirender dengan ukuran lain (misalnya mode YouTube setelah
+            # warta 4:3); render ulang supaya ukuran deck tetap benar
+            result = None
+        if result is not None:
+            with instrumentation.span("splice"):
+                parallel_render.splice(prs, result)
+        else:
+            with instrumentation.span("gen_slides"):
+                gen_slides_func(prs, cover_info, [section])
+            if key:
+                result = parallel_render.export_slides(
+                    prs, [prs.slides[i] for i in range(start_idx, len(prs.slides))])
+        # Hasil yang mengubah ukuran deck tidak bisa dipakai ulang dengan
+        # kunci ini, jadi tidak disimpan
+        if key and hit is None and result is not None and tuple(result[0]) == current_size:
+            section_cache.put(key, result)
 
         end_idx = len(prs.slides)
 
-        bg_to_use = random.choice(bg_files) if use_bg and bg_files else None
+        bg_to_use = None
+        if use_bg and bg_files and bg_mode != "layout":
+            bg_to_use = bg_map.get(index, rng.choice(bg_files))
 
         for i in range(start_idx, end_idx):
-            if bg_to_use:
-                apply_background(prs, prs.slides[i], bg_to_use)
+            if bg_layout is not None:
+                use_layout(prs.slides[i], bg_layout)
+            elif bg_to_use:
+                with instrumentation.span("apply_background"):
+                    apply_background(prs, prs.slides[i], bg_to_use,
+                                     bake_overlay, image_parts)
                 set_font_white(prs.slides[i])
 
-        if is_warta_section and warta_doc:
-            if warta_mode == "Normal":
-                warta_normal.generate_warta(warta_doc, prs)
-            else:
-                warta_wide.generate_warta(warta_doc, prs)
+        if warta_doc and is_warta_section(section):
+            with instrumentation.span("generate_warta"):
+                if warta_mode == "Normal":
+                    warta_normal.generate_warta(warta_doc, prs)
+                else:
+                    warta_wide.generate_warta(warta_doc, prs)
+
+        yield
+
+
+def merge_and_generate(warta_doc, cover_info, data_isi, gen_slides_func, warta_mode, output=None, writer=None,
+                       workers=None, seed=None, bg_map=None):
+    """
+    Buat file PPTX lengkap.
+
+    Args:
+        output: file biner tujuan (default BytesIO baru)
+        writer: "stream" untuk menulis slide ke zip per section
+            (pptx_writer), atau "pptx" untuk prs.save() biasa di akhir;
+            default dari SLIDENAULI_PPTX_WRITER
+        workers: jumlah process untuk render section paralel; default
+            dari SLIDENAULI_RENDER_WORKERS (0 = berurutan)
+        seed: seed pilihan background (default: hash dokumen dan tanggal,
+            lihat `deck_seed`)
+        bg_map: background tetap per slot, lihat `build_slides`
+
+    Returns:
+        `output`, sudah di-seek ke awal
+    """
+    prs = Presentation()
+    if output is None:
+        output = BytesIO()
+    batches = build_slides(prs, warta_doc, cover_info, data_isi,
+                           gen_slides_func, warta_mode, workers, seed, bg_map)
+
+    if (writer or PPTX_WRITER) == "stream":
+        pptx_writer.write_streaming(prs, batches, output)
+    else:
+        for _ in batches:
+            pass
+        pptx_writer.save_reproducible(prs, output)
 
-    ppt_io = BytesIO()
-    prs.save(ppt_io)
-    ppt_io.seek(0)
-    return ppt_io
+    instrumentation.count("slides", len(prs.slides))
+    instrumentation.count("bytes", output.tell())
+    output.seek(0)
+    return output
@@ -0,0 +1,225 @@
+# parallel_render.py
+import copyreg
+import multiprocessing
+import os
+import pickle
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from io import BytesIO
+
+from lxml import etree
+from pptx import Presentation
+from pptx.dml.color import RGBColor
+from pptx.opc.constants import RELATIONSHIP_TYPE as RT
+from pptx.oxml import parse_xml
+from pptx.parts.image import ImagePart
+
+# Jumlah worker process untuk render section; 0 atau 1 = berurutan
+RENDER_WORKERS = int(os.getenv("SLIDENAULI_RENDER_WORKERS", "0"))
+# Di bawah jumlah section ini biaya kirim data ke worker lebih besar
+# daripada waktu render yang dihemat
+MIN_SECTIONS = int(os.getenv("SLIDENAULI_RENDER_MIN_SECTIONS", "4"))
+
+_R_NS = "{http://schemas.openxmlformats.org/officeDocument/2006/relationships}"
+
+_pool = None
+_pool_workers = 0
+_pool_lock = threading.Lock()
+
+# RGBColor (tuple dengan __new__(r, g, b)) tidak bisa di-unpickle apa adanya;
+# cover_info["text_color"] dikirim ke worker
+copyreg.pickle(RGBColor, lambda color: (RGBColor, tuple(color)))
+
+# Presentasi kerja di setiap worker, dipakai ulang antar section
+_worker_prs = None
+
+
+class UnsupportedSlide(Exception):
+    """Slide punya relationship yang tidak bisa disalin antar proses."""
+
+
+def _get_pool(workers):
+    global _pool, _pool_workers
+    with _pool_lock:
+        if _pool is None or _pool_workers != workers:
+            if _pool is not None:
+                _pool.shutdown(wait=False)
+            # "spawn": aman dipakai dari server Streamlit yang multi-thread
+            _pool = ProcessPoolExecutor(
+                max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+            _pool_workers = workers
+        return _pool
+
+
+def _discard_pool(pool):
+    global _pool
+    with _pool_lock:
+        if _pool is pool:
+            _pool = None
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+def _results(pool, results, n):
+    # Jika worker mati, section sisanya dirender berurutan (None)
+    done = 0
+    try:
+        for result in results:
+            done += 1
+            yield result
+    except BrokenProcessPool:
+        _discard_pool(pool)
+    for _ in range(n - done):
+        yield None
+
+
+def _export_slide(slide, layouts):
+    rels = []
+    for rId, rel in slide.part.rels.items():
+        if rel.reltype == RT.SLIDE_LAYOUT:
+            rels.append((rId, rel.reltype, "layout", None))
+        elif rel.is_external:
+            rels.append((rId, rel.reltype, "external", rel.target_ref))
+        elif isinstance(rel.target_part, ImagePart):
+            rels.append((rId, rel.reltype, "image", rel.target_part.blob))
+        else:
+            raise UnsupportedSlide(rel.reltype)
+    return layouts.index(slide.slide_layout), etree.tostring(slide._element), rels
+
+
+def render_section(gen_slides_func, cover_info, section, slide_size):
+    """
+    Render satu section di presentasi kosong (dijalankan di worker).
+
+    Returns:
+        (slide_size, [(indeks layout, XML slide, relationship), ...]),
+        atau None jika slide tidak bisa disalin dan harus dirender ulang
+        di proses utama
+    """
+    global _worker_prs
+    if _worker_prs is None:
+        _worker_prs = Presentation()
+    prs = _worker_prs
+    prs.slide_width, prs.slide_height = slide_size
+    gen_slides_func(prs, cover_info, [section])
+    try:
+        return export_slides(prs, list(prs.slides))
+    finally:
+        # Kosongkan lagi untuk section berikutnya
+        sldIdLst = prs.slides._sldIdLst
+        for sldId in list(sldIdLst):
+            prs.part.drop_rel(sldId.rId)
+            sldIdLst.remove(sldId)
+
+
+def export_slides(prs, slides):
+    """
+    Salinan XML `slides` (milik `prs`) dalam bentuk yang bisa dikirim
+    antar proses atau disimpan, untuk dipasang lagi dengan `splice`.
+
+    Returns:
+        (slide_size, [(indeks layout, XML slide, relationship), ...]),
+        atau None jika ada relationship yang tidak bisa disalin
+    """
+    layouts = list(prs.slide_layouts)
+    try:
+        exported = [_export_slide(slide, layouts) for slide in slides]
+    except UnsupportedSlide:
+        return None
+    return (int(prs.slide_width), int(prs.slide_height)), exported
+
+
+def _replace_children(dst, src, keep):
+    # Ganti semua anak `dst` dengan anak `src`, kecuali elemen `keep`
+    # milik `dst` yang tetap di tempatnya (isinya diurus pemanggil)
+    kept, src_kept = getattr(dst, keep), getattr(src, keep)
+    for child in list(dst):
+        if child is not kept:
+            dst.remove(child)
+    dst.attrib.update(src.attrib)
+    before = True
+    for child in list(src):
+        if child is src_kept:
+            before = False
+        elif before:
+            kept.addprevious(child)
+        else:
+            dst.append(child)
+
+
+def splice(prs, rendered):
+    """
+    Tambahkan slide hasil `render_section` ke `prs`, sesuai urutan.
+
+    Raises:
+        RuntimeError: jika slide dirender dengan ukuran yang berbeda dari
+            ukuran `prs` (ukuran deck tidak pernah diubah di sini)
+    """
+    slide_size, slides = rendered
+    if (prs.slide_width, prs.slide_height) != tuple(slide_size):
+        raise RuntimeError(
+            f"Ukuran slide {tuple(slide_size)} berbeda dengan deck "
+            f"{(prs.slide_width, prs.slide_height)}")
+
+    for layout_index, xml, rels in slides:
+        slide = prs.slides.add_slide(prs.slide_layouts[layout_index])
+        part = slide.part
+        rId_map = {}
+        for rId, reltype, kind, target in rels:
+            if kind == "layout":
+                new_rId = part.relate_to(slide.slide_layout.part, reltype)
+            elif kind == "external":
+                new_rId = part.relate_to(target, reltype, is_external=True)
+            else:
+                _, new_rId = part.get_or_add_image_part(BytesIO(target))
+            if new_rId != rId:
+                rId_map[rId] = new_rId
+
+        src = parse_xml(xml)
+        if rId_map:
+            for el in src.iter():
+                for attr, value in el.attrib.items():
+                    if attr.startswith(_R_NS) and value in rId_map:
+                        el.set(attr, rId_map[value])
+
+        # Elemen p:cSld dan p:spTree slide baru sudah dipegang oleh
+        # slide.shapes, jadi isinya yang diganti, bukan elemennya
+        _replace_children(slide._element, src, "cSld")
+        _replace_children(slide._element.cSld, src.cSld, "spTree")
+        spTree = slide._element.cSld.spTree
+        spTree[:] = list(src.cSld.spTree)
+
+
+def render_sections(gen_slides_func, cover_info, sections, slide_size, workers=None):
+    """
+    Render semua section paralel di process pool.
+
+    Args:
+        gen_slides_func: fungsi generate_slides modul ppt; harus bisa
+            di-pickle (fungsi level modul, atau method Profile)
+        cover_info: dict cover (skip_cover otomatis diaktifkan)
+        sections: list section dari extract_isi
+        slide_size: (lebar, tinggi) presentasi tujuan
+        workers: jumlah worker, default RENDER_WORKERS
+
+    Returns:
+        iterator hasil `render_section` per section sesuai urutan, atau
+        None jika mode paralel tidak dipakai (worker <= 1, section terlalu
+        sedikit, atau fungsi tidak bisa di-pickle)
+    """
+    workers = RENDER_WORKERS if workers is None else workers
+    if workers <= 1 or len(sections) < MIN_SECTIONS:
+        return None
+    cover_info = dict(cover_info, skip_cover=True)
+    try:
+        pickle.loads(pickle.dumps((gen_slides_func, cover_info)))
+    except (pickle.PicklingError, AttributeError, TypeError):
+        return None
+
+    pool = _get_pool(workers)
+    n = len(sections)
+    # Beberapa section per kiriman supaya overhead antar proses kecil
+    chunksize = max(1, n // (workers * 4))
+    results = pool.map(render_section, [gen_slides_func] * n, [cover_info] * n,
+                       sections, [slide_size] * n, chunksize=chunksize)
+    return _results(pool, results, n)
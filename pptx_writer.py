@@ -0,0 +1,211 @@
+# pptx_writer.py
+import re
+import weakref
+import zipfile
+from io import BytesIO
+
+from pptx.opc.constants import CONTENT_TYPE as CT
+from pptx.opc.constants import RELATIONSHIP_TYPE as RT
+from pptx.opc.oxml import serialize_part_xml
+from pptx.opc.package import Part
+from pptx.opc.packuri import CONTENT_TYPES_URI, PACKAGE_URI, PackURI
+from pptx.opc.serialized import _ContentTypesItem
+from pptx.parts.image import ImagePart
+
+import instrumentation
+
+# Tanggal tetap untuk semua entry zip, supaya input yang sama
+# menghasilkan file yang sama persis (tanggal terkecil format zip)
+ZIP_DATE_TIME = (1980, 1, 1, 0, 0, 0)
+
+
+def _zip_info(name):
+    info = zipfile.ZipInfo(name, date_time=ZIP_DATE_TIME)
+    info.compress_type = zipfile.ZIP_DEFLATED
+    return info
+
+
+class _ManifestEntry:
+    """Cukup partname dan content type untuk [Content_Types].xml."""
+
+    __slots__ = ("partname", "content_type")
+
+    def __init__(self, partname, content_type):
+        self.partname = partname
+        self.content_type = content_type
+
+
+class StreamingPptxWriter:
+    """
+    Penulis .pptx yang langsung memindahkan slide ke file zip begitu
+    slide selesai dibuat, sebagai pengganti `prs.save()` di akhir.
+
+    Setiap `flush()` menulis semua slide yang ada di `prs` (beserta
+    gambar yang dipakainya) ke zip, lalu melepas slide tersebut dari
+    presentasi sehingga object tree-nya bisa dibuang. Yang tetap di
+    memori hanya master, layout, dan daftar part yang sudah ditulis.
+    `close()` menulis sisa package, presentation.xml dengan urutan slide
+    lengkap, dan [Content_Types].xml.
+
+    Gambar dengan isi sama (sha1) hanya ditulis sekali ke zip walaupun
+    python-pptx membuat image part baru setelah slide lama dilepas.
+    """
+
+    def __init__(self, prs, file):
+        self.prs = prs
+        self.zip = zipfile.ZipFile(file, "w", compression=zipfile.ZIP_DEFLATED)
+        self.closed = False
+        # part -> partname di zip; weak supaya part yang dilepas tetap bisa dibuang
+        self._written = weakref.WeakKeyDictionary()
+        self._media = {}
+        self._names = set()
+        self._counters = {}
+        self._manifest = []
+        self._slides = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.zip.close()
+            self.closed = True
+
+    def _resident_parts(self):
+        # Part yang tetap di presentasi (master, layout, tema, dst.)
+        parts = set()
+        stack = [self.prs.part]
+        while stack:
+            for rel in stack.pop().rels.values():
+                if rel.is_external or rel.reltype == RT.SLIDE:
+                    continue
+                if rel.target_part not in parts:
+                    parts.add(rel.target_part)
+                    stack.append(rel.target_part)
+        return parts
+
+    def _next_name(self, partname, taken):
+        m = re.match(r"(.*?)\d*(\.\w+)$", partname)
+        tmpl = m.group(1) + "%d" + m.group(2)
+        n = self._counters.get(tmpl, 0)
+        while True:
+            n += 1
+            name = tmpl % n
+            if name not in self._names and name not in taken:
+                break
+        self._counters[tmpl] = n
+        return PackURI(name)
+
+    def _store(self, part):
+        self.zip.writestr(_zip_info(part.partname.membername), part.blob)
+        if part._rels:
+            self.zip.writestr(_zip_info(part.partname.rels_uri.membername), part.rels.xml)
+        self._names.add(part.partname)
+        self._manifest.append(_ManifestEntry(part.partname, part.content_type))
+
+    def _write_part(self, part, resident, taken):
+        if part in resident or part in self._written:
+            return
+        if isinstance(part, ImagePart):
+            name = self._media.get(part.sha1)
+            if name is not None:
+                part.partname = name
+                self._written[part] = name
+                return
+
+        part.partname = self._next_name(part.partname, taken)
+        self._written[part] = part.partname
+        if isinstance(part, ImagePart):
+            self._media[part.sha1] = part.partname
+
+        # Target ditulis dulu supaya partname-nya sudah final saat .rels dibuat
+        for rel in part.rels.values():
+            if not rel.is_external:
+                self._write_part(rel.target_part, resident, taken)
+        self._store(part)
+
+    def _rename_resident(self, resident):
+        # Part baru di presentasi tidak tahu nama yang sudah terpakai di zip
+        taken = {part.partname for part in resident}
+        for part in resident:
+            if part.partname in self._names:
+                taken.discard(part.partname)
+                part.partname = self._next_name(part.partname, taken)
+                taken.add(part.partname)
+        return taken
+
+    def flush(self):
+        """Tulis semua slide yang ada di presentasi ke zip lalu lepaskan."""
+        if self.closed:
+            raise RuntimeError("Writer PPTX sudah ditutup")
+        prs_part = self.prs.part
+        sldIdLst = self.prs.slides._sldIdLst
+        resident = self._resident_parts()
+        taken = self._rename_resident(resident)
+
+        for sldId in list(sldIdLst):
+            rId = sldId.rId
+            slide_part = prs_part.related_part(rId)
+            self._write_part(slide_part, resident, taken)
+            self._slides.append(slide_part.partname)
+            sldIdLst.remove(sldId)
+            prs_part.drop_rel(rId)
+
+    def close(self):
+        """Tulis sisa package dan tutup file zip."""
+        if self.closed:
+            return
+        self.flush()
+
+        prs_part = self.prs.part
+        package = prs_part.package
+        sldIdLst = self.prs.slides._sldIdLst
+        stubs = set()
+        for partname in self._slides:
+            # Part kosong hanya sebagai target relationship presentation.xml
+            stub = Part(partname, CT.PML_SLIDE, package)
+            stubs.add(stub)
+            sldIdLst.add_sldId(prs_part.relate_to(stub, RT.SLIDE))
+
+        self._rename_resident(self._resident_parts())
+        for part in package.iter_parts():
+            if part not in stubs:
+                self._store(part)
+
+        self.zip.writestr(_zip_info(PACKAGE_URI.rels_uri.membername), package._rels.xml)
+        self.zip.writestr(
+            _zip_info(CONTENT_TYPES_URI.membername),
+            serialize_part_xml(_ContentTypesItem.xml_for(self._manifest)))
+        self.zip.close()
+        self.closed = True
+
+
+def write_streaming(prs, batches, file):
+    """
+    Tulis presentasi ke `file` dengan StreamingPptxWriter, flush setiap
+    kali generator `batches` menghasilkan satu kelompok slide.
+    """
+    with StreamingPptxWriter(prs, file) as writer:
+        for _ in batches:
+            with instrumentation.span("save"):
+                writer.flush()
+        with instrumentation.span("save"):
+            writer.close()
+    return file
+
+
+def save_reproducible(prs, file):
+    """
+    `prs.save()` lalu salin ulang isi zip dengan tanggal entry tetap
+    (python-pptx memakai waktu saat ini untuk setiap entry).
+    """
+    with instrumentation.span("save"):
+        buf = BytesIO()
+        prs.save(buf)
+        with zipfile.ZipFile(buf) as src, \
+                zipfile.ZipFile(file, "w", compression=zipfile.ZIP_DEFLATED) as dst:
+            for info in src.infolist():
+                dst.writestr(_zip_info(info.filename), src.read(info))
+    return file
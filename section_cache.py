@@ -0,0 +1,88 @@
+# section_cache.py
+import functools
+import json
+import marshal
+import os
+
+import pptx
+
+import slide_engine
+import slide_renderer
+from disk_cache import DiskCache, MemoryCache, files_token, sha256_hex
+
+# Cache slide hasil render per section; "0" untuk mematikan
+SECTION_CACHE = os.getenv("SLIDENAULI_SECTION_CACHE", "1") != "0"
+MEMORY_MAX_BYTES = int(
+    float(os.getenv("SLIDENAULI_SECTION_CACHE_MEMORY_MB", "32")) * 1024 * 1024)
+
+# Isi cover_info yang ikut menentukan hasil render section. Cover tidak
+# dirender ulang per section (skip_cover), jadi minggu/topik/tanggal
+# tidak ikut; background dipasang setelah render tetapi tetap dimasukkan
+# supaya kunci mengikuti pilihan background.
+RENDER_KEYS = ("mode", "text_color", "use_bg", "bg_mode", "bg_bake_overlay")
+
+_disk = DiskCache("sections", int(
+    float(os.getenv("SLIDENAULI_SECTION_CACHE_MB", "100")) * 1024 * 1024))
+_memory = MemoryCache(MEMORY_MAX_BYTES)
+
+
+@functools.lru_cache(maxsize=None)
+def _renderer_code_token():
+    # Hasil render lama tidak berlaku lagi jika kode renderer berubah
+    paths = [module.__file__ for module in (slide_renderer, slide_engine)]
+    return files_token(paths, os.path.dirname(slide_renderer.__file__),
+                       pptx.__version__)
+
+
+def renderer_token(gen_slides_func):
+    """
+    Identitas gaya slide untuk `gen_slides_func`, atau None jika hasilnya
+    tidak boleh di-cache (hanya generate_slides milik Profile yang punya
+    identitas isi profil).
+    """
+    profile = getattr(gen_slides_func, "__self__", None)
+    token = getattr(profile, "cache_token", None)
+    if token is None or getattr(profile, "cover_every_call", False):
+        # Cover ikut dirender di setiap section, jadi hasilnya bergantung
+        # pada minggu/topik/tanggal yang tidak ada di kunci
+        return None
+    return f"{profile.name}:{token}:{_renderer_code_token()}"
+
+
+def section_key(token, cover_info, section, slide_size):
+    """Kunci cache untuk satu section (sha256 hex)."""
+    payload = {
+        "renderer": token,
+        "cover": {k: cover_info.get(k) for k in RENDER_KEYS},
+        "section": section,
+        "slide_size": [int(v) for v in slide_size],
+    }
+    return sha256_hex(json.dumps(payload, sort_keys=True, default=str).encode())
+
+
+def get(key):
+    """Hasil `parallel_render.export_slides` untuk `key`, atau None."""
+    rendered = _memory.get(key)
+    if rendered is not None:
+        return rendered
+
+    data = _disk.get(key)
+    if data is None:
+        return None
+    try:
+        rendered = marshal.loads(data)
+    except (EOFError, ValueError, TypeError):
+        return None
+    _memory.put(key, rendered, len(data))
+    return rendered
+
+
+def put(key, rendered):
+    data = marshal.dumps(rendered)
+    _memory.put(key, rendered, len(data))
+    _disk.put(key, data)
+
+
+def clear():
+    _memory.clear()
+    _disk.clear()
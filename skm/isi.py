@@ -1,20 +1,33 @@
 # isi.py
-import streamlit as st
-from docx import Document
+import os
 import re
+import sys
 
+if __name__ == "__main__":
+    # Dijalankan sendiri (streamlit run isi.py): modul bersama ada di root repo
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from keyword_matcher import KeywordMatcher
+from doc_analysis import analyze
+
+# Keyword pembuka section, dikompilasi sekali saat import
+KEYWORDS_ACARA = KeywordMatcher([
+    "BERNYANYI", "VOTUM", "HUKUM", "DOA", "EPISTEL", "E P I S T E L",
+    "PENGAKUAN IMAN", "WARTA", "K O O R", "KOOR", "KHOTBAH", "K H O T B A H",
+    "PENGAKUAN DOSA", "JANJI KESELAMATAN", "DOA PENUTUP", "ACARA PANDIDION",
+    "MENGUMPULKAN PERSEMBAHAN", "PELEAN", "IBADAH", "PRELIDIUM", "SAAT TEDUH",
+    "BERKAT", "SAPA-SAPA"
+])
+# Penanda awal tata ibadah; paragraf sebelumnya diabaikan
+START_MARKERS = KeywordMatcher([
+    "TATATERTIB", "PRELIDIUM", "SAPA-SAPA",
+    "BNSEKOLAHMINGGU", "CARIJIWABERSAMAYESUS", "SAATTEDUH"
+])
+PRELIDIUM_SONG = KeywordMatcher(["BNSM", "BESM", "KJ", "BE."])
 
-def extract_isi(doc):
-    paragraphs = [re.sub(r'\s+', ' ', p.text).strip()
-                  for p in doc.paragraphs if p.text.strip()]
 
-    keywords_acara = [
-        "BERNYANYI", "VOTUM", "HUKUM", "DOA", "EPISTEL", "E P I S T E L",
-        "PENGAKUAN IMAN", "WARTA", "K O O R", "KOOR", "KHOTBAH", "K H O T B A H",
-        "PENGAKUAN DOSA", "JANJI KESELAMATAN", "DOA PENUTUP", "ACARA PANDIDION",
-        "MENGUMPULKAN PERSEMBAHAN", "PELEAN", "IBADAH", "PRELIDIUM", "SAAT TEDUH",
-        "BERKAT", "SAPA-SAPA"
-    ]
+def extract_isi(doc):
+    analysis = analyze(doc)
 
     re_nomor = re.compile(r"^\s*(\d{1,2})[\.\s:]+(.*)", re.IGNORECASE)
     re_koor = re.compile(r"K\s*O\s*O\s*R", re.IGNORECASE)
@@ -26,26 +39,20 @@ def extract_isi(doc):
     manual_counter = 1
     start_processing = False
 
-    for text in paragraphs:
-        normalized_text = text.upper().replace(" ", "")
-
-        if any(k in normalized_text for k in ["TATATERTIB", "PRELIDIUM", "SAPA-SAPA"]):
+    for text, text_upper, normalized_text in analysis.lines():
+        if START_MARKERS.search(normalized_text):
             start_processing = True
 
         if not start_processing:
-            if any(k in normalized_text for k in ["BNSEKOLAHMINGGU", "CARIJIWABERSAMAYESUS", "SAATTEDUH"]):
-                start_processing = True
-            else:
-                continue
+            continue
 
         match_num = re_nomor.match(text)
-        is_keyword = any(normalized_text.startswith(
-            k.replace(" ", "")) for k in keywords_acara)
+        is_keyword = KEYWORDS_ACARA.match(normalized_text) is not None
 
         # Deteksi khusus judul lagu di bagian Prelidium yang tidak pakai nomor/keyword
         is_prelidium_song = False
         if start_processing and not current_section and not match_num and not is_keyword:
-            if any(x in normalized_text for x in ["BNSM", "BESM", "KJ", "BE."]):
+            if PRELIDIUM_SONG.search(normalized_text):
                 is_prelidium_song = True
 
         if match_num or is_keyword or is_prelidium_song:
@@ -80,7 +87,7 @@ def extract_isi(doc):
                     if re_limit_koor.search(text):
                         current_section["is_koor"] = False
                         current_section["content_lines"].append(text)
-                    elif "-" in text or "PKL" in text.upper() or "WIB" in text.upper():
+                    elif "-" in text or "PKL" in text_upper or "WIB" in text_upper:
                         current_section["header_lines"].append(text)
                     else:
                         current_section["content_lines"].append(text)
@@ -102,6 +109,9 @@ def extract_isi(doc):
 
 
 if __name__ == "__main__":
+    import streamlit as st
+    from docx import Document
+
     st.title("Ekstraksi Detail Acara")
     uploaded_file = st.file_uploader("Upload file DOCX", type=["docx"])
 
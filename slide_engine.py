@@ -0,0 +1,113 @@
+# slide_engine.py
+import threading
+from copy import deepcopy
+
+from pptx import Presentation
+from pptx.oxml.ns import qn
+
+_RUN_TAGS = (qn("a:r"), qn("a:br"), qn("a:fld"))
+
+_scratch = None
+_prototypes = {}
+# Presentasi scratch dipakai bersama semua thread (sesi Streamlit); ukuran
+# slide dan slide sementara di dalamnya tidak boleh diubah bersamaan
+_lock = threading.Lock()
+
+
+class _Prototype:
+    __slots__ = ("shapes", "slots", "slide_size")
+
+    def __init__(self, shapes, slots, slide_size):
+        self.shapes = shapes
+        # (indeks shape, indeks paragraf, rPr) untuk tiap teks
+        self.slots = slots
+        self.slide_size = slide_size
+
+
+def _scratch_prs():
+    global _scratch
+    if _scratch is None:
+        _scratch = Presentation()
+    return _scratch
+
+
+def _build(prs, draw, n_texts, layout_index):
+    scratch = _scratch_prs()
+    scratch.slide_width = prs.slide_width
+    scratch.slide_height = prs.slide_height
+
+    placeholders = [f"__slot{i}__" for i in range(n_texts)]
+    slide = scratch.slides.add_slide(scratch.slide_layouts[layout_index])
+    draw(scratch, slide, placeholders)
+
+    spTree = slide.shapes._spTree
+    shapes = [deepcopy(el) for el in spTree.iter_shape_elms()]
+
+    slots = [None] * n_texts
+    for si, shape in enumerate(shapes):
+        for pi, p in enumerate(shape.iter(qn("a:p"))):
+            text = "".join(t.text or "" for t in p.iter(qn("a:t")))
+            if text not in placeholders:
+                continue
+            rPr = p.find(qn("a:r")).find(qn("a:rPr"))
+            for child in [c for c in p if c.tag in _RUN_TAGS]:
+                p.remove(child)
+            slots[placeholders.index(text)] = (si, pi, rPr)
+
+    # Slide prototype tidak perlu disimpan di presentasi scratch
+    sldIdLst = scratch.slides._sldIdLst
+    sldId = sldIdLst[-1]
+    scratch.part.drop_rel(sldId.rId)
+    sldIdLst.remove(sldId)
+
+    return _Prototype(shapes, slots, (scratch.slide_width, scratch.slide_height))
+
+
+def stamp(prs, key, texts, draw, layout_index=6):
+    """
+    Tambah satu slide ke `prs` dengan menyalin XML prototype lalu
+    mengganti teksnya, tanpa menjalankan setter python-pptx per slide.
+
+    Args:
+        prs: Presentation tujuan
+        key: kunci gaya slide (hashable); satu prototype per kunci dan
+            ukuran slide
+        texts: daftar teks, sesuai urutan yang dipakai `draw`
+        draw: fungsi `draw(prs, slide, texts)` yang menggambar slide
+            dengan python-pptx biasa; hanya dipanggil sekali per
+            prototype dengan teks placeholder, jadi tidak boleh
+            bergantung pada isi teks
+        layout_index: indeks slide layout untuk slide baru
+
+    Returns:
+        slide baru
+    """
+    proto_key = (key, prs.slide_width, prs.slide_height, len(texts), layout_index)
+    proto = _prototypes.get(proto_key)
+    if proto is None:
+        with _lock:
+            proto = _prototypes.get(proto_key)
+            if proto is None:
+                proto = _build(prs, draw, len(texts), layout_index)
+                _prototypes[proto_key] = proto
+
+    # `draw` boleh mengubah ukuran slide (mode YouTube); ikuti di deck tujuan
+    if (prs.slide_width, prs.slide_height) != proto.slide_size:
+        prs.slide_width, prs.slide_height = proto.slide_size
+
+    slide = prs.slides.add_slide(prs.slide_layouts[layout_index])
+    spTree = slide.shapes._spTree
+    shapes = [deepcopy(el) for el in proto.shapes]
+    spTree.extend(shapes)
+
+    for text, slot in zip(texts, proto.slots):
+        if slot is None:
+            continue
+        si, pi, rPr = slot
+        p = list(shapes[si].iter(qn("a:p")))[pi]
+        p.append_text(text)
+        if rPr is not None:
+            for r in p.iterchildren(qn("a:r")):
+                r.insert(0, deepcopy(rPr))
+
+    return slide
@@ -0,0 +1,380 @@
+# slide_renderer.py
+import hashlib
+import json
+import os
+import re
+
+from pptx.dml.color import RGBColor
+from pptx.enum.text import MSO_ANCHOR, PP_ALIGN
+from pptx.oxml.ns import qn
+from pptx.oxml.xmlchemy import OxmlElement
+from pptx.util import Inches, Pt
+
+import slide_engine
+
+PROFILE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "profiles")
+
+ALIGNMENTS = {
+    "center": PP_ALIGN.CENTER,
+    "left": PP_ALIGN.LEFT,
+    "right": PP_ALIGN.RIGHT,
+    "justify": PP_ALIGN.JUSTIFY,
+}
+
+# Tata letak mode YouTube: bar hijau (chroma key) di bawah layar
+YOUTUBE_SIZE = (Inches(13.333), Inches(7.5))
+YOUTUBE_BAR_HEIGHT = Inches(1.8)
+YOUTUBE_COVER_SIZE = 40
+CHROMA_GREEN = RGBColor(0, 255, 0)
+YOUTUBE_TEXT_BG = RGBColor(0, 0, 0)
+YOUTUBE_TEXT = RGBColor(255, 255, 255)
+
+_BULLET_TAGS = tuple(qn(f"a:{tag}") for tag in ("buNone", "buAutoNum", "buChar", "buBlip"))
+
+
+def _color(value):
+    return RGBColor.from_string(value)
+
+
+class ContentRule:
+    """
+    Cara membuat slide isi untuk section yang judulnya (huruf besar,
+    tanpa spasi) memuat salah satu `keywords`; tanpa `keywords` aturan
+    berlaku untuk semua section.
+    """
+
+    def __init__(self, data, profile):
+        keywords = data.get("keywords")
+        self.keywords = tuple(keywords) if keywords is not None else None
+        self.font_size = data.get("font_size", profile.font_size)
+        self.alignment = ALIGNMENTS[data.get("alignment", "center")]
+        self.font_name = data.get("font_name")
+        self.header = data.get("header", False)
+        self.squash_spaces = data.get("squash_spaces", False)
+        self.skip_prefixes = tuple(data.get("skip_prefixes", ()))
+        self.lines_per_slide = data.get("lines_per_slide", 1)
+        self.skip_title = data.get("skip_title", False)
+
+    def matches(self, judul_upper):
+        return self.keywords is None or any(kw in judul_upper for kw in self.keywords)
+
+    def contents(self, isi_raw):
+        lines = []
+        for line in isi_raw:
+            if self.squash_spaces:
+                clean_line = " ".join(str(line).split())
+            else:
+                clean_line = str(line).strip()
+            if clean_line and not clean_line.startswith(self.skip_prefixes):
+                lines.append(clean_line)
+
+        n = self.lines_per_slide
+        if n == 1:
+            return lines
+        return ["\n".join(lines[i:i + n]) for i in range(0, len(lines), n)]
+
+
+class Profile:
+    """
+    Gaya slide satu jenis ibadah, dibaca dari profiles/<nama>.json.
+
+    Font, ukuran, warna, posisi cover, format judul lagu dan aturan slide
+    isi semuanya berasal dari file profil; regex dan keyword dikompilasi
+    sekali saat profil dimuat, dan XML slide untuk tiap gaya disimpan
+    oleh slide_engine. Menambah jenis ibadah baru cukup dengan satu file
+    profil baru.
+    """
+
+    def __init__(self, name, data):
+        self.name = name
+        # Berubah jika isi profil berubah; dipakai sebagai kunci cache render
+        self.cache_token = hashlib.sha256(
+            json.dumps(data, sort_keys=True).encode()).hexdigest()
+        self.title = data.get("name", name)
+        self.font_name = data["font_name"]
+        self.font_size = data["font_size"]
+        self.text_color = _color(data.get("text_color", "000000"))
+        size = data.get("slide_size")
+        self.slide_size = (Inches(size[0]), Inches(size[1])) if size else None
+        self.youtube = data.get("youtube", False)
+
+        header = data.get("header", {})
+        self.header_size = header.get("font_size", 18)
+        self.header_color = _color(header.get("color", "FFA500"))
+
+        cover = data.get("cover", {})
+        self.cover_size = cover.get("font_size", 54)
+        self.cover_date_size = cover.get("date_font_size", 32)
+        self.cover_top = Inches(cover.get("top", 1.5))
+        self.cover_date_bottom = Inches(cover.get("date_bottom", 2))
+        self.cover_word_wrap = cover.get("word_wrap", True)
+        # Cover dibuat di setiap panggilan generate_slides, skip_cover diabaikan
+        self.cover_every_call = cover.get("every_call", False)
+
+        judul = data.get("judul", {})
+        self.title_size = judul.get("font_size", self.font_size)
+        self.fixed_titles = tuple(judul.get("fixed", ()))
+        lagu = judul.get("lagu")
+        self.lagu_keywords = tuple(lagu["keywords"]) if lagu else ()
+        if lagu:
+            self.lagu_pattern = re.compile(lagu["pattern"], re.IGNORECASE)
+            self.lagu_template = lagu.get("template")
+            self.lagu_default = lagu.get("default", "")
+            cut = lagu.get("cut")
+            self.lagu_cut = re.compile(cut, re.IGNORECASE) if cut else None
+            self.lagu_cut_first = lagu.get("cut_first", False)
+
+        self.skip_isi = tuple(data.get("skip_isi", ()))
+        self.rules = [ContentRule(rule, self) for rule in data.get("isi", [])]
+
+    def __reduce__(self):
+        # Dikirim ke worker process cukup sebagai nama profil
+        return load_profile, (self.name,)
+
+    def format_judul(self, text):
+        if text is None:
+            return ""
+        text = str(text).strip()
+        for fixed in self.fixed_titles:
+            if fixed in text.upper():
+                return fixed
+        if text.endswith(":"):
+            text = text[:-1].strip()
+
+        text_upper = text.upper().replace(" ", "")
+
+        if any(keyword in text_upper for keyword in self.lagu_keywords):
+            if self.lagu_cut is not None and self.lagu_cut_first:
+                # Hapus bagian BL. beserta sisa teks di belakangnya
+                text = self.lagu_cut.split(text)[0].strip()
+            match = self.lagu_pattern.search(text)
+            if match:
+                if self.lagu_template is not None:
+                    return match.expand(self.lagu_template)
+                bagian_awal = match.group(1).strip()
+                detail_lagu = match.group(2).strip()
+                if self.lagu_cut is not None and not self.lagu_cut_first:
+                    detail_lagu = self.lagu_cut.split(detail_lagu)[0].strip()
+                detail_lagu = re.sub(r"\s+", " ", detail_lagu)
+                return f"{bagian_awal or self.lagu_default}\n{detail_lagu}"
+
+        if "KOOR" in text_upper and "-" in text:
+            parts = [p.strip() for p in text.split("-") if p.strip()]
+            prefix_match = re.match(r"^([^:]+)", text)
+            prefix = prefix_match.group(1).strip() if prefix_match else "K O O R"
+            formatted_parts = []
+            for p in parts:
+                clean_p = re.sub(rf"^{re.escape(prefix)}", "",
+                                 p, flags=re.IGNORECASE).strip()
+                if clean_p:
+                    formatted_parts.append(f"{prefix} - {clean_p}")
+            return "\n".join(formatted_parts)
+
+        return text
+
+    def apply_styling(self, paragraph, font_size=None, alignment=PP_ALIGN.CENTER, font_color=None, font_name=None):
+        paragraph.alignment = alignment
+        pPr = paragraph._p.get_or_add_pPr()
+        for child in [c for c in pPr if c.tag in _BULLET_TAGS]:
+            pPr.remove(child)
+
+        buNone = OxmlElement('a:buNone')
+        pPr.insert(0, buNone)
+        pPr.set('marL', '0')
+        pPr.set('indent', '0')
+
+        for run in paragraph.runs:
+            run.font.name = font_name or self.font_name
+            run.font.bold = True
+            run.font.size = Pt(font_size or self.font_size)
+            run.font.color.rgb = font_color or self.text_color
+
+    def _draw_youtube_bar(self, prs, slide):
+        prs.slide_width, prs.slide_height = YOUTUBE_SIZE
+
+        bg_shape = slide.shapes.add_shape(
+            1, Inches(0), prs.slide_height - YOUTUBE_BAR_HEIGHT,
+            prs.slide_width, YOUTUBE_BAR_HEIGHT)
+        bg_shape.fill.solid()
+        bg_shape.fill.fore_color.rgb = CHROMA_GREEN
+        bg_shape.line.fill.background()
+
+        width = prs.slide_width - Inches(1.5)
+        height = YOUTUBE_BAR_HEIGHT - Inches(0.4)
+        left = (prs.slide_width - width) // 2
+        top = prs.slide_height - YOUTUBE_BAR_HEIGHT + Inches(0.2)
+
+        txt_bg = slide.shapes.add_shape(1, left, top, width, height)
+        txt_bg.fill.solid()
+        txt_bg.fill.fore_color.rgb = YOUTUBE_TEXT_BG
+        txt_bg.line.fill.background()
+        return left, top, width, height
+
+    def _draw_styled_slide(self, prs, slide, texts, font_size, alignment, font_name, mode, text_color):
+        if mode == "YouTube":
+            left, top, width, height = self._draw_youtube_bar(prs, slide)
+            font_color = YOUTUBE_TEXT
+        else:
+            if len(texts) > 1:
+                h_width = prs.slide_width - Inches(1)
+                h_height = Inches(0.5)
+                h_left = (prs.slide_width - h_width) // 2
+                h_top = Inches(0.2)
+
+                header_box = slide.shapes.add_textbox(h_left, h_top, h_width, h_height)
+                h_p = header_box.text_frame.paragraphs[0]
+                h_p.text = texts[0]
+                self.apply_styling(
+                    h_p, font_size=self.header_size, font_color=text_color or self.header_color)
+
+            width = prs.slide_width - Inches(0.5)
+            height = prs.slide_height - Inches(1.5)
+            left = (prs.slide_width - width) // 2
+            top = (prs.slide_height - height) // 2
+            font_color = self.text_color
+
+        txBox = slide.shapes.add_textbox(left, top, width, height)
+        tf = txBox.text_frame
+        tf.word_wrap = True
+        tf.vertical_anchor = MSO_ANCHOR.MIDDLE
+
+        p = tf.paragraphs[0]
+        p.text = texts[-1]
+        self.apply_styling(p, font_size=font_size, alignment=alignment,
+                           font_color=text_color or font_color, font_name=font_name)
+
+    def create_styled_slide(self, prs, content_text, font_size=None, alignment=PP_ALIGN.CENTER, header_text=None,
+                            font_name=None, mode="Projector", text_color=None):
+        if not str(content_text).strip():
+            return
+        font_size = font_size or self.font_size
+        font_name = font_name or self.font_name
+        if not self.youtube:
+            mode = "Projector"
+        texts = [str(content_text)]
+        if header_text:
+            texts.insert(0, str(header_text).replace("\n", " "))
+        slide_engine.stamp(
+            prs, (self.name, "styled", font_size, alignment, font_name, mode, text_color), texts,
+            lambda prs, slide, texts: self._draw_styled_slide(
+                prs, slide, texts, font_size, alignment, font_name, mode, text_color))
+
+    def _draw_cover_slide(self, prs, slide, texts, mode, text_color):
+        if mode == "YouTube":
+            left, top, width, height = self._draw_youtube_bar(prs, slide)
+            tb_main = slide.shapes.add_textbox(left, top, width, height)
+            tf_main = tb_main.text_frame
+            tf_main.vertical_anchor = MSO_ANCHOR.MIDDLE
+            p_main = tf_main.paragraphs[0]
+            p_main.text = texts[0]
+            self.apply_styling(p_main, font_size=YOUTUBE_COVER_SIZE,
+                               font_color=text_color or YOUTUBE_TEXT)
+            return
+
+        width_main = prs.slide_width - Inches(1)
+        height_main = Inches(4)
+        left_main = (prs.slide_width - width_main) // 2
+
+        tb_main = slide.shapes.add_textbox(
+            left_main, self.cover_top, width_main, height_main)
+        tf_main = tb_main.text_frame
+        if self.cover_word_wrap:
+            tf_main.word_wrap = True
+        tf_main.vertical_anchor = MSO_ANCHOR.MIDDLE
+
+        p_main = tf_main.paragraphs[0]
+        p_main.text = texts[0]
+        self.apply_styling(p_main, font_size=self.cover_size, font_color=text_color)
+
+        width_date = prs.slide_width - Inches(1)
+        height_date = Inches(1)
+        left_date = (prs.slide_width - width_date) // 2
+        top_date = prs.slide_height - self.cover_date_bottom
+
+        tb_date = slide.shapes.add_textbox(
+            left_date, top_date, width_date, height_date)
+        p_date = tb_date.text_frame.paragraphs[0]
+        p_date.text = texts[1]
+        self.apply_styling(p_date, font_size=self.cover_date_size, font_color=text_color)
+
+    def create_cover_slide(self, prs, minggu, topik, tanggal, mode="Projector", text_color=None):
+        if not self.youtube:
+            mode = "Projector"
+        if mode == "YouTube":
+            texts = [str(minggu).upper()]
+        else:
+            texts = [f"{minggu}\n\"{topik}\"", tanggal]
+        slide_engine.stamp(
+            prs, (self.name, "cover", mode, text_color), texts,
+            lambda prs, slide, texts: self._draw_cover_slide(prs, slide, texts, mode, text_color))
+
+    def generate_slides(self, prs, cover_data, sections):
+        text_color = cover_data.get('text_color') if cover_data else None
+        mode = cover_data.get('mode', 'Projector') if cover_data and self.youtube else "Projector"
+        if mode == "YouTube":
+            prs.slide_width, prs.slide_height = YOUTUBE_SIZE
+        elif self.slide_size:
+            prs.slide_width, prs.slide_height = self.slide_size
+
+        if cover_data and (self.cover_every_call or not cover_data.get('skip_cover', False)):
+            self.create_cover_slide(
+                prs, cover_data['minggu'], cover_data['topik'], cover_data['tanggal'], mode=mode, text_color=text_color)
+
+        for section in sections:
+            raw_judul = section.get('judul', '').strip()
+            isi_raw = section.get('isi', [])
+
+            if not raw_judul and not isi_raw:
+                continue
+
+            raw_judul_upper = raw_judul.upper().replace(" ", "")
+            rule = next((r for r in self.rules if r.matches(raw_judul_upper)), None)
+
+            formatted_judul = self.format_judul(raw_judul)
+            if rule is None or not rule.skip_title:
+                self.create_styled_slide(
+                    prs, formatted_judul, font_size=self.title_size, mode=mode, text_color=text_color)
+
+            if any(kw in raw_judul_upper for kw in self.skip_isi):
+                continue
+
+            if isi_raw and rule is not None:
+                header_text = formatted_judul if rule.header else None
+                for content_text in rule.contents(isi_raw):
+                    self.create_styled_slide(
+                        prs,
+                        content_text,
+                        font_size=rule.font_size,
+                        alignment=rule.alignment,
+                        header_text=header_text,
+                        font_name=rule.font_name,
+                        mode=mode,
+                        text_color=text_color
+                    )
+
+
+_profiles = {}
+
+
+def load_profile(name):
+    """
+    Profil gaya dari profiles/<name>.json (disimpan setelah dimuat).
+
+    Raises:
+        RuntimeError: jika file profil tidak ada atau tidak valid
+    """
+    profile = _profiles.get(name)
+    if profile is None:
+        path = os.path.join(PROFILE_DIR, f"{name}.json")
+        try:
+            with open(path, encoding="utf-8") as f:
+                data = json.load(f)
+            profile = Profile(name, data)
+        except (OSError, ValueError, KeyError) as e:
+            raise RuntimeError(f"Profil slide '{name}' tidak bisa dimuat: {e}") from e
+        _profiles[name] = profile
+    return profile
+
+
+def list_profiles():
+    return sorted(f[:-5] for f in os.listdir(PROFILE_DIR) if f.endswith(".json"))
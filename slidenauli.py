@@ -0,0 +1,278 @@
+# slidenauli.py
+#
+# Buat slide tanpa UI Streamlit.
+#
+#   python -m slidenauli build tata.docx --warta warta.docx --mode YouTube --bg
+#   python -m slidenauli build folder_tata/ --out-dir hasil/ --jobs 4
+#
+# Jika yang diberikan folder, setiap file .doc/.docx di dalamnya diproses
+# paralel dengan process pool. File yang terdeteksi sebagai warta dilewati.
+
+import argparse
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from io import BytesIO
+
+import instrumentation
+import liturgy_registry
+import logic
+from doc_analysis import analyze
+from doc_converter import ensure_docx_bytes
+
+DOC_EXTENSIONS = (".doc", ".docx")
+MODES = ("Projector", "YouTube")
+
+
+class BuildError(RuntimeError):
+    """Dokumen tidak bisa dibuat menjadi slide (format salah, dst.)."""
+
+
+class WartaDocumentError(BuildError):
+    """File yang diberikan sebagai tata ibadah ternyata warta."""
+
+
+def read_docx(path):
+    """Bytes .docx dari `path`; file .doc dikonversi dulu."""
+    with open(path, "rb") as f:
+        data = f.read()
+    docx_bytes, _ = ensure_docx_bytes(data, os.path.basename(path))
+    return docx_bytes
+
+
+def warta_mode(fmt, warta_fmt):
+    # Sama dengan app.py: warta lebar hanya untuk tata remaja + warta remaja
+    if fmt == "Ibadah Remaja" and warta_fmt == "Warta Remaja":
+        return "Wide"
+    return "Normal"
+
+
+def build_deck(tata_path, output_path, warta_path=None, fmt=None,
+               mode="Projector", use_bg=False, render_workers=None, seed=None,
+               bg_map=None, bg_mode="shared", log=print):
+    """
+    Deteksi format, ekstrak cover dan isi, lalu tulis file .pptx.
+
+    Args:
+        tata_path: file tata ibadah (.doc/.docx)
+        output_path: file .pptx tujuan
+        warta_path: file warta (opsional)
+        fmt: paksa format tertentu; default hasil deteksi
+        mode: "Projector" atau "YouTube"
+        use_bg: pakai background dari folder pics/
+        render_workers: jumlah process untuk render section paralel
+            (default SLIDENAULI_RENDER_WORKERS)
+        seed: seed pilihan background (default: hash isi dokumen)
+        bg_map: background tetap per slot, {"cover": file, indeks: file}
+        bg_mode: cara memasang background, salah satu logic.BG_MODES
+            ("layout" = satu background untuk semua slide)
+        log: fungsi untuk pesan progres
+
+    Returns:
+        path file .pptx
+
+    Raises:
+        BuildError: jika dokumen tidak bisa diproses
+        RuntimeError: jika file tidak bisa dibaca atau dikonversi
+    """
+    with instrumentation.trace("build", file=os.path.basename(tata_path),
+                               mode=mode, use_bg=use_bg) as t:
+        _build_deck(t, tata_path, output_path, warta_path, fmt, mode, use_bg,
+                    render_workers, seed, bg_map, bg_mode, log)
+    return output_path
+
+
+def _build_deck(t, tata_path, output_path, warta_path, fmt, mode, use_bg,
+                render_workers, seed, bg_map, bg_mode, log):
+    tata_bytes = read_docx(tata_path)
+    detected, confidence = logic.detect_format_bytes(tata_bytes)
+    log(f"{tata_path}: terdeteksi {detected} (keyakinan {confidence:.0%})")
+    if "Warta" in detected and fmt is None:
+        raise WartaDocumentError(
+            f"{tata_path} terdeteksi sebagai {detected}, bukan tata ibadah")
+
+    if fmt is None:
+        fmt = detected if detected in liturgy_registry.formats() else None
+    if fmt is None:
+        fmt = liturgy_registry.formats()[0]
+        log(f"{tata_path}: format tidak dikenali, memakai {fmt}")
+    t.attrs["format"] = fmt
+    entry_point = "ppt_stream" if mode == "YouTube" else "ppt"
+    if not liturgy_registry.has_entry_point(fmt, entry_point):
+        raise BuildError(f"Mode {mode} tidak tersedia untuk {fmt}")
+
+    warta_doc = None
+    w_mode = "Normal"
+    if warta_path:
+        # Document lengkap tetap dibutuhkan karena isi warta disalin ke slide
+        from docx import Document
+
+        warta_bytes = read_docx(warta_path)
+        warta_fmt, _ = logic.detect_format_bytes(warta_bytes)
+        if "Warta" not in warta_fmt:
+            raise BuildError(f"{warta_path} terdeteksi sebagai {warta_fmt}, bukan warta")
+        warta_doc = Document(BytesIO(warta_bytes))
+        w_mode = warta_mode(fmt, warta_fmt)
+
+    analysis = analyze(tata_bytes)
+    with instrumentation.span("extract_cover"):
+        data_cover = liturgy_registry.load(fmt, "cover").extract_cover(analysis)
+    with instrumentation.span("extract_isi"):
+        data_isi = liturgy_registry.load(fmt, "isi").extract_isi(analysis)
+
+    c_info = {
+        "minggu": data_cover.get('minggu', ''),
+        "topik": data_cover.get('topik', ''),
+        "tanggal": data_cover.get('tanggal', ''),
+        "use_bg": use_bg,
+        "bg_mode": bg_mode,
+        "mode": mode
+    }
+
+    gen_slides = liturgy_registry.load(fmt, entry_point).generate_slides
+    try:
+        with open(output_path, "wb") as f:
+            logic.merge_and_generate(
+                warta_doc, c_info, data_isi, gen_slides, w_mode, output=f,
+                workers=render_workers, seed=seed, bg_map=bg_map)
+    except BaseException:
+        # Jangan tinggalkan .pptx setengah jadi
+        if os.path.exists(output_path):
+            os.remove(output_path)
+        raise
+    log(f"{tata_path}: {len(data_isi)} acara -> {output_path}")
+
+
+def _output_path(tata_path, out_dir):
+    stem = os.path.splitext(os.path.basename(tata_path))[0]
+    return os.path.join(out_dir, stem + ".pptx")
+
+
+def _build_job(tata_path, output_path, options):
+    # Dijalankan di worker process; pesan dikumpulkan dan dicetak oleh induk.
+    # Satu dokumen yang gagal tidak boleh menghentikan seluruh batch.
+    messages = []
+    try:
+        build_deck(tata_path, output_path, log=messages.append, **options)
+        return "ok", messages
+    except WartaDocumentError:
+        messages.append(f"{tata_path}: dilewati (warta)")
+        return "skip", messages
+    except Exception as e:
+        messages.append(f"{tata_path}: GAGAL - {type(e).__name__}: {e}")
+        return "failed", messages
+
+
+def build_directory(folder, out_dir, jobs=None, **options):
+    """
+    Proses semua file tata ibadah di `folder` secara paralel.
+
+    File yang nama hasilnya sama (misalnya x.doc dan x.docx -> x.pptx)
+    tidak diproses dan dihitung gagal, supaya tidak saling menimpa.
+
+    Returns:
+        dict jumlah dokumen per status: "ok", "skip", "failed"
+    """
+    paths = [os.path.join(folder, f) for f in sorted(os.listdir(folder))
+             if f.lower().endswith(DOC_EXTENSIONS) and not f.startswith("~$")]
+    if options.get("warta_path"):
+        warta = os.path.abspath(options["warta_path"])
+        paths = [p for p in paths if os.path.abspath(p) != warta]
+    counts = {"ok": 0, "skip": 0, "failed": 0}
+
+    by_output = {}
+    for path in paths:
+        output = os.path.normcase(os.path.abspath(_output_path(path, out_dir)))
+        by_output.setdefault(output, []).append(path)
+    jobs_to_run = []
+    for output, sources in by_output.items():
+        if len(sources) > 1:
+            names = ", ".join(os.path.basename(p) for p in sources)
+            for path in sources:
+                print(f"{path}: GAGAL - hasil {os.path.basename(output)} "
+                      f"bentrok dengan file lain ({names})")
+            counts["failed"] += len(sources)
+        else:
+            jobs_to_run.append((sources[0], _output_path(sources[0], out_dir)))
+    if not jobs_to_run:
+        return counts
+
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        futures = [pool.submit(_build_job, path, output, options)
+                   for path, output in jobs_to_run]
+        for future in as_completed(futures):
+            status, messages = future.result()
+            for message in messages:
+                print(message)
+            counts[status] += 1
+    return counts
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="slidenauli")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    build = commands.add_parser("build", help="buat .pptx dari tata ibadah")
+    build.add_argument("tata", help="file tata ibadah, atau folder berisi banyak file")
+    build.add_argument("--warta", help="file warta yang ikut dimasukkan")
+    build.add_argument("--format", choices=liturgy_registry.formats(),
+                       help="paksa format (default: deteksi otomatis)")
+    build.add_argument("--mode", choices=MODES, default="Projector")
+    build.add_argument("--bg", action="store_true", help="pakai background dari pics/")
+    build.add_argument("--bg-mode", choices=logic.BG_MODES, default="shared",
+                       help="layout = satu background untuk semua slide lewat slide "
+                            "layout (file lebih kecil); default acak per section")
+    build.add_argument("-o", "--output", help="file .pptx tujuan (hanya untuk satu file)")
+    build.add_argument("--out-dir", help="folder hasil (default: folder file tata)")
+    build.add_argument("--jobs", type=int, default=None,
+                       help="jumlah process paralel untuk mode folder")
+    build.add_argument("--render-workers", type=int, default=None,
+                       help="jumlah process untuk render section dalam satu deck")
+    build.add_argument("--seed", help="seed pilihan background (default: hash isi dokumen)")
+    build.add_argument("--bg-map", help='file JSON {"cover": file, "0": file, ...} '
+                                        "untuk memaksa background per slot")
+    args = parser.parse_args(argv)
+
+    bg_map = None
+    if args.bg_map:
+        try:
+            with open(args.bg_map, encoding="utf-8") as f:
+                bg_map = json.load(f)
+        except (OSError, ValueError) as e:
+            parser.error(f"--bg-map tidak bisa dibaca: {e}")
+
+    options = {
+        "warta_path": args.warta,
+        "fmt": args.format,
+        "mode": args.mode,
+        "use_bg": args.bg,
+        "bg_mode": args.bg_mode,
+        "render_workers": args.render_workers,
+        "seed": args.seed,
+        "bg_map": bg_map,
+    }
+
+    if os.path.isdir(args.tata):
+        if args.output:
+            parser.error("--output tidak bisa dipakai untuk folder, gunakan --out-dir")
+        out_dir = args.out_dir or args.tata
+        os.makedirs(out_dir, exist_ok=True)
+        counts = build_directory(args.tata, out_dir, args.jobs, **options)
+        print(f"Selesai: {counts['ok']} berhasil, {counts['skip']} dilewati, "
+              f"{counts['failed']} gagal")
+        return 1 if counts["failed"] or not counts["ok"] else 0
+
+    out_dir = args.out_dir or os.path.dirname(os.path.abspath(args.tata))
+    output = args.output or _output_path(args.tata, out_dir)
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    try:
+        build_deck(args.tata, output, **options)
+    except (RuntimeError, OSError) as e:
+        print(f"{args.tata}: GAGAL - {e}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,11 +1,17 @@
 # cover.py
-import streamlit as st
-from docx import Document
+import os
 import re
+import sys
+
+if __name__ == "__main__":
+    # Dijalankan sendiri (streamlit run cover.py): modul bersama ada di root repo
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from doc_analysis import analyze
 
 
 def extract_cover(doc):
-    paragraphs = [p.text.strip() for p in doc.paragraphs if p.text.strip()]
+    paragraphs = analyze(doc).stripped
 
     tata_ibadah = "TATA IBADAH"
     nama_minggu = ""
@@ -80,6 +86,9 @@ def extract_cover(doc):
 
 
 if __name__ == "__main__":
+    import streamlit as st
+    from docx import Document
+
     st.title("Ekstraksi Data Cover")
     uploaded_file = st.file_uploader("Upload file DOCX", type=["docx"])
 
@@ -0,0 +1,149 @@
+# tests/test_audit_log.py
+#
+# AuditLogger terhadap server HTTP stub lokal (pengganti api.telegram.org
+# dan api.ipify.org): batching, retry 5xx / 429 retry_after, dan record
+# yang dibuang saat antrian penuh.
+#
+#   python -m pytest -q tests
+
+import json
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import audit_log  # noqa: E402
+
+
+class Stub:
+    """Server stub; `responses` berisi (status, body) untuk POST berikutnya."""
+
+    def __init__(self):
+        self.posts = []
+        self.responses = []
+        self.received = threading.Event()
+        # Jika diatur, POST ditahan sampai event ini di-set
+        self.hold = None
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def _reply(self, status, body):
+                data = body.encode()
+                self.send_response(status)
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def do_GET(self):
+                self._reply(200, "127.0.0.1")
+
+            def do_POST(self):
+                length = int(self.headers["Content-Length"])
+                form = parse_qs(self.rfile.read(length).decode())
+                stub.posts.append((time.monotonic(), form["text"][0]))
+                stub.received.set()
+                if stub.hold is not None:
+                    stub.hold.wait(10)
+                status, body = stub.responses.pop(0) if stub.responses else (200, "{}")
+                self._reply(status, body)
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def close(self):
+        if self.hold is not None:
+            self.hold.set()
+        self.server.shutdown()
+        self.server.server_close()
+
+
+@pytest.fixture
+def stub():
+    s = Stub()
+    yield s
+    s.close()
+
+
+def record(name):
+    return {"file_name": name, "format_type": "Ibadah Sore", "mode": "Projector",
+            "bg": "Tidak", "device": "PC", "browser": "test", "note": "-",
+            "waktu": "01/01/2026 10:00:00"}
+
+
+def logger(stub, **kwargs):
+    options = dict(api_base=stub.url, ip_url=stub.url, batch_wait=0.3, backoff=0.01)
+    options.update(kwargs)
+    return audit_log.AuditLogger("TOKEN", "chat", **options)
+
+
+def test_records_batched_into_one_message(stub):
+    log = logger(stub)
+    for i in range(5):
+        assert log.log(record(f"file{i}.pptx"))
+    assert log.flush(timeout=5)
+
+    assert len(stub.posts) == 1
+    text = stub.posts[0][1]
+    assert all(f"file{i}.pptx" in text for i in range(5))
+    assert "127.0.0.1" in text
+    assert (log.sent, log.failed, log.dropped) == (1, 0, 0)
+
+
+def test_server_error_retried(stub):
+    stub.responses = [(500, "{}"), (502, "{}")]
+    log = logger(stub, batch_wait=0)
+    log.log(record("a.pptx"))
+    assert log.flush(timeout=5)
+
+    assert len(stub.posts) == 3
+    assert (log.sent, log.failed) == (1, 0)
+
+
+def test_rate_limit_waits_retry_after(stub):
+    stub.responses = [(429, json.dumps({"ok": False, "parameters": {"retry_after": 1}}))]
+    log = logger(stub, batch_wait=0)
+    log.log(record("a.pptx"))
+    assert log.flush(timeout=5)
+
+    assert len(stub.posts) == 2
+    assert stub.posts[1][0] - stub.posts[0][0] >= 0.9
+    assert log.sent == 1
+
+
+def test_client_error_not_retried(stub):
+    stub.responses = [(400, "{}")]
+    log = logger(stub, batch_wait=0)
+    log.log(record("a.pptx"))
+    assert log.flush(timeout=5)
+
+    assert len(stub.posts) == 1
+    assert (log.sent, log.failed) == (0, 1)
+
+
+def test_dropped_when_queue_full(stub):
+    stub.hold = threading.Event()
+    log = logger(stub, max_queue=2, batch_wait=0)
+    assert log.log(record("first.pptx"))
+    # Worker sudah mengambil record pertama dan tertahan di server
+    assert stub.received.wait(5)
+
+    assert log.log(record("a.pptx"))
+    assert log.log(record("b.pptx"))
+    assert not log.log(record("c.pptx"))
+    assert not log.log(record("d.pptx"))
+    assert log.dropped == 2
+
+    stub.hold.set()
+    assert log.flush(timeout=5)
+    texts = "".join(text for _, text in stub.posts)
+    assert "a.pptx" in texts and "b.pptx" in texts and "c.pptx" not in texts
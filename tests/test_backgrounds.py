@@ -0,0 +1,54 @@
+# tests/test_backgrounds.py
+#
+# Background dari bg_map di luar folder pics/ tidak boleh masuk daftar
+# kandidat background acak (registry.files()).
+#
+#   python -m pytest -q tests
+
+import os
+import sys
+
+import pytest
+from PIL import Image
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import backgrounds  # noqa: E402
+from disk_cache import DiskCache  # noqa: E402
+
+
+def _image(path, color):
+    Image.new("RGB", (64, 48), color).save(path, "JPEG")
+    return path
+
+
+@pytest.fixture
+def registry(tmp_path, monkeypatch):
+    cache = DiskCache("backgrounds", 10 * 1024 * 1024)
+    cache.dir = str(tmp_path / "cache")
+    monkeypatch.setattr(backgrounds, "_bg_cache", cache)
+    folder = tmp_path / "pics"
+    folder.mkdir()
+    _image(str(folder / "a.jpg"), "red")
+    _image(str(folder / "b.jpg"), "blue")
+    return backgrounds.BackgroundRegistry(str(folder))
+
+
+def test_external_path_not_in_files(registry, tmp_path):
+    before = registry.files()
+    external = _image(str(tmp_path / "external.jpg"), "green")
+
+    assert registry.get(external) is not None
+    assert registry.files() == before
+    assert registry.get(before[0]) is not None
+    assert registry.files() == before
+
+
+def test_external_path_reloaded_when_changed(registry, tmp_path):
+    external = _image(str(tmp_path / "external.jpg"), "green")
+    first = registry.get(external)
+    _image(external, "white")
+    os.utime(external, ns=(0, os.stat(external).st_mtime_ns + 10 ** 9))
+
+    assert registry.get(external).sha1 != first.sha1
+    assert registry.get(str(tmp_path / "missing.jpg")) is None
@@ -0,0 +1,71 @@
+# tests/test_bg_layout.py
+#
+# bg_mode "layout": teks putih hanya jika slide layout background benar
+# dibuat; tanpa layout (gambar tidak ada) teks tetap warna bawaan.
+#
+#   python -m pytest -q tests
+
+import os
+import sys
+from io import BytesIO
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "benchmarks"))
+
+from pptx import Presentation  # noqa: E402
+from pptx.dml.color import RGBColor  # noqa: E402
+
+import backgrounds  # noqa: E402
+import liturgy_registry  # noqa: E402
+import logic  # noqa: E402
+import section_cache  # noqa: E402
+import synthetic_docs  # noqa: E402
+from doc_analysis import analyze  # noqa: E402
+
+FMT = "Ibadah Indonesia Umum"
+WHITE = RGBColor(255, 255, 255)
+
+pytestmark = pytest.mark.skipif(not backgrounds.registry.files(),
+                                reason="folder pics/ kosong")
+
+
+def build(bg_map):
+    analysis = analyze(synthetic_docs.make_tata(FMT, sections=4))
+    isi = liturgy_registry.load(FMT, "isi").extract_isi(analysis)
+    cover_info = {"minggu": "", "topik": "", "tanggal": "", "use_bg": True,
+                  "bg_mode": "layout", "mode": "Projector"}
+    gen_slides = liturgy_registry.load(FMT, "ppt").generate_slides
+    data = logic.merge_and_generate(None, cover_info, isi, gen_slides, "Normal",
+                                    workers=0, seed=0, bg_map=bg_map).getvalue()
+    return cover_info, Presentation(BytesIO(data))
+
+
+def text_colors(slide):
+    return {run.font.color.rgb
+            for shape in slide.shapes if shape.has_text_frame
+            for p in shape.text_frame.paragraphs for run in p.runs
+            if run.text.strip() and run.font.color and run.font.color.type is not None}
+
+
+@pytest.fixture(autouse=True)
+def no_section_cache(monkeypatch):
+    monkeypatch.setattr(section_cache, "SECTION_CACHE", False)
+
+
+def test_layout_background_white_text():
+    cover_info, prs = build(None)
+    assert cover_info["text_color"] == WHITE
+    for slide in prs.slides:
+        assert slide.slide_layout.name == "Background"
+        assert text_colors(slide) <= {WHITE}
+
+
+def test_missing_layout_image_keeps_default_text(tmp_path):
+    cover_info, prs = build({"cover": str(tmp_path / "tidak_ada.jpg")})
+    assert "text_color" not in cover_info
+    for slide in prs.slides:
+        assert slide.slide_layout.name != "Background"
+        assert WHITE not in text_colors(slide)
@@ -0,0 +1,34 @@
+# tests/test_cli.py
+#
+# Error CLI: file yang tidak bisa dibaca dan nama hasil yang bentrok
+# di mode folder harus menjadi pesan GAGAL, bukan traceback / saling timpa.
+#
+#   python -m pytest -q tests
+
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "benchmarks"))
+
+import slidenauli  # noqa: E402
+import synthetic_docs  # noqa: E402
+
+
+def test_missing_file_fails_cleanly(tmp_path, capsys):
+    missing = str(tmp_path / "tidak_ada.docx")
+    assert slidenauli.main(["build", missing]) == 1
+    assert f"{missing}: GAGAL" in capsys.readouterr().err
+
+
+def test_colliding_outputs_not_built(tmp_path, capsys):
+    data = synthetic_docs.make_tata("Ibadah Sore")
+    for name in ("minggu.doc", "minggu.docx"):
+        (tmp_path / name).write_bytes(data)
+
+    counts = slidenauli.build_directory(str(tmp_path), str(tmp_path / "out"))
+
+    assert counts == {"ok": 0, "skip": 0, "failed": 2}
+    assert "bentrok" in capsys.readouterr().out
+    assert not (tmp_path / "out" / "minggu.pptx").exists()
@@ -0,0 +1,36 @@
+# tests/test_detect_format.py
+#
+# Confidence deteksi format: judul umum "TATA IBADAH" tidak boleh
+# menurunkan keyakinan untuk format yang terdeteksi dengan benar.
+#
+#   python -m pytest -q tests
+
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "benchmarks"))
+
+import logic  # noqa: E402
+import synthetic_docs  # noqa: E402
+
+
+@pytest.mark.parametrize("fmt", list(synthetic_docs.HEADERS))
+def test_correct_format_full_confidence(fmt):
+    assert logic.detect_format_bytes(synthetic_docs.make_tata(fmt)) == (fmt, 1.0)
+
+
+@pytest.mark.parametrize("remaja, fmt", [(False, "Warta Jemaat"), (True, "Warta Remaja")])
+def test_warta_full_confidence(remaja, fmt):
+    assert logic.detect_format_bytes(synthetic_docs.make_warta(remaja=remaja)) == (fmt, 1.0)
+
+
+def test_confidence_drops_on_conflicting_keywords():
+    assert logic.classify_format(["TATA IBADAH SORE", "PUKUL 17.00 WIB"]) == ("Ibadah Sore", 1.0)
+    assert logic.classify_format(["TATA IBADAH SORE", "PUKUL 10.00 WIB"]) == ("Ibadah Sore", 0.5)
+    assert logic.classify_format(["TATA IBADAH MINGGU"]) == (
+        "Ibadah Indonesia Umum", logic.GENERIC_CONFIDENCE)
+    assert logic.classify_format(["Selamat pagi"]) == ("Unknown", 0.0)
@@ -0,0 +1,51 @@
+# tests/test_disk_cache.py
+#
+# DiskCache.put yang gagal di tengah jalan tidak boleh meninggalkan
+# file sementara di folder cache.
+#
+#   python -m pytest -q tests
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import disk_cache  # noqa: E402
+from disk_cache import DiskCache  # noqa: E402
+
+
+@pytest.fixture
+def cache(tmp_path):
+    c = DiskCache("test", 1024 * 1024)
+    c.dir = str(tmp_path)
+    return c
+
+
+def test_put_get(cache):
+    cache.put("a", b"isi")
+    assert cache.get("a") == b"isi"
+    assert cache.get("b") is None
+
+
+def test_failed_replace_removes_temp_file(cache, tmp_path, monkeypatch):
+    def fail(src, dst):
+        raise OSError("disk penuh")
+
+    monkeypatch.setattr(disk_cache.os, "replace", fail)
+    cache.put("a", b"isi")
+
+    assert os.listdir(tmp_path) == []
+    assert cache.get("a") is None
+
+
+def test_interrupted_write_removes_temp_file(cache, tmp_path, monkeypatch):
+    def interrupt(src, dst):
+        raise KeyboardInterrupt
+
+    monkeypatch.setattr(disk_cache.os, "replace", interrupt)
+    with pytest.raises(KeyboardInterrupt):
+        cache.put("a", b"isi")
+
+    assert os.listdir(tmp_path) == []
@@ -0,0 +1,114 @@
+# tests/test_docx_reader.py
+#
+# docx_reader harus menghasilkan teks yang sama dengan python-docx
+# `[p.text for p in Document(...).paragraphs]`.
+#
+#   python -m pytest -q tests
+
+import os
+import random
+import sys
+from io import BytesIO
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from docx import Document  # noqa: E402
+from docx.enum.text import WD_BREAK  # noqa: E402
+from docx.oxml import parse_xml  # noqa: E402
+
+import docx_reader  # noqa: E402
+
+NS = ('xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main" '
+      'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships"')
+
+# Isi run yang mungkin muncul di dokumen jemaat
+RUN_PARTS = [
+    '<w:t>BERNYANYI KJ 12</w:t>',
+    '<w:t xml:space="preserve">  spasi  </w:t>',
+    '<w:t/>',
+    '<w:tab/>',
+    '<w:ptab w:relativeTo="margin" w:alignment="right" w:leader="none"/>',
+    '<w:br/>',
+    '<w:br w:type="textWrapping"/>',
+    '<w:br w:type="page"/>',
+    '<w:br w:type="column"/>',
+    '<w:cr/>',
+    '<w:noBreakHyphen/>',
+    '<w:softHyphen/>',
+    '<w:lastRenderedPageBreak/>',
+    '<w:rPr><w:b/></w:rPr>',
+]
+
+
+def _run(rng):
+    return "<w:r>" + "".join(rng.choice(RUN_PARTS) for _ in range(rng.randint(0, 4))) + "</w:r>"
+
+
+def _paragraph(rng):
+    children = []
+    for _ in range(rng.randint(0, 5)):
+        kind = rng.random()
+        if kind < 0.6:
+            children.append(_run(rng))
+        elif kind < 0.8:
+            children.append(f'<w:hyperlink r:id="rId99">{_run(rng)}{_run(rng)}</w:hyperlink>')
+        elif kind < 0.9:
+            # Revisi: python-docx tidak membaca teks di dalam w:ins
+            children.append(f"<w:ins>{_run(rng)}</w:ins>")
+        else:
+            children.append('<w:pPr><w:jc w:val="center"/></w:pPr>')
+    return parse_xml(f"<w:p {NS}>{''.join(children)}</w:p>")
+
+
+def _save(doc):
+    buf = BytesIO()
+    doc.save(buf)
+    return buf.getvalue()
+
+
+def _expected(data):
+    return [p.text for p in Document(BytesIO(data)).paragraphs]
+
+
+def test_crafted_document():
+    doc = Document()
+    p = doc.add_paragraph("a\tb\nc")
+    p.add_run().add_break(WD_BREAK.PAGE)
+    p.add_run().add_break(WD_BREAK.LINE)
+    p.add_run(" x ")
+    doc.add_paragraph("")
+    doc.add_table(rows=2, cols=2).cell(0, 0).text = "di dalam tabel"
+    doc.add_paragraph()
+    body = doc.element.body
+    body.insert(len(body) - 1, parse_xml(
+        f'<w:p {NS}><w:hyperlink r:id="rId1"><w:r><w:t>tautan</w:t></w:r></w:hyperlink>'
+        f'<w:r><w:t xml:space="preserve"> sesudah</w:t><w:tab/><w:br/></w:r></w:p>'))
+    data = _save(doc)
+
+    texts = docx_reader.read_paragraph_texts(data)
+    assert texts == _expected(data)
+    assert "di dalam tabel" not in texts
+    assert "tautan sesudah\t\n" in texts
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_random_documents(seed):
+    rng = random.Random(seed)
+    doc = Document()
+    body = doc.element.body
+    for _ in range(rng.randint(1, 30)):
+        if rng.random() < 0.1:
+            doc.add_table(rows=1, cols=1).cell(0, 0).text = "tabel"
+        else:
+            body.insert(len(body) - 1, _paragraph(rng))
+    data = _save(doc)
+
+    assert docx_reader.read_paragraph_texts(data) == _expected(data)
+    assert list(docx_reader.iter_paragraph_texts(BytesIO(data))) == _expected(data)
+
+
+def test_invalid_file():
+    with pytest.raises(RuntimeError):
+        docx_reader.read_paragraph_texts(b"bukan file docx")
@@ -0,0 +1,88 @@
+# tests/test_keyword_matcher.py
+#
+# KeywordMatcher harus sama persis dengan loop lama di extract_isi:
+#   any(normalized.startswith(k.replace(" ", "")) for k in keywords)  -> match
+#   any(k in normalized for k in keywords)                            -> search
+#
+#   python -m pytest -q tests
+
+import importlib
+import itertools
+import os
+import random
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from keyword_matcher import KeywordMatcher, normalize  # noqa: E402
+
+# Saling tumpang tindih: awalan satu sama lain, dengan dan tanpa spasi,
+# dan karakter khusus regex
+OVERLAPPING = ["DOA", "DOA PENUTUP", "DO", "KOOR", "K O O R", "KOOR REMAJA",
+               "BE.", "BE", "BNSM", "BN", "SAPA-SAPA", "SAPA", "PATIK", "PATIK III"]
+
+TEXT_PARTS = ["tata tertib", "Saat Teduh", "prelidium", "kj 12", "doa", "Doa Penutup", "D O A", "do", "koor", " K O O R ", "Koor Remaja",
+              "be.", "BE", "bex", "b.e", "bnsm 4", "sapa-sapa", "Sapa sapa", "patik",
+              "PATIK II", "\t", "  ", "-", ".", "1. ", "lirik biasa", "ama", ""]
+
+
+def old_match(keywords, normalized_text):
+    return any(normalized_text.startswith(k.replace(" ", "")) for k in keywords)
+
+
+def old_search(keywords, normalized_text):
+    return any(k.replace(" ", "") in normalized_text for k in keywords)
+
+
+def texts(seed, n=2000):
+    rng = random.Random(seed)
+    for _ in range(n):
+        yield "".join(rng.choice(TEXT_PARTS) for _ in range(rng.randint(1, 4)))
+
+
+def module_keywords():
+    lists = [OVERLAPPING]
+    for module in ("indo_umum", "batak_umum", "remaja", "sore", "skm"):
+        isi = importlib.import_module(f"{module}.isi")
+        lists.append(isi.KEYWORDS_ACARA.keywords)
+    skm = importlib.import_module("skm.isi")
+    lists += [skm.START_MARKERS.keywords, skm.PRELIDIUM_SONG.keywords]
+    return lists
+
+
+@pytest.mark.parametrize("keywords", module_keywords())
+def test_same_as_old_loops(keywords):
+    matcher = KeywordMatcher(keywords)
+    corpus = itertools.chain(texts(0), (k.lower() for k in keywords),
+                             (" " + k + " tambahan" for k in keywords))
+    for text in corpus:
+        normalized = normalize(text)
+        assert (matcher.match(normalized) is not None) == old_match(keywords, normalized), text
+        assert (matcher.search(normalized) is not None) == old_search(keywords, normalized), text
+
+
+def test_longest_keyword_wins():
+    matcher = KeywordMatcher(OVERLAPPING)
+    assert matcher.match(normalize("Doa Penutup")) == "DOAPENUTUP"
+    assert matcher.match(normalize("doa pagi")) == "DOA"
+    assert matcher.match(normalize("dosa")) == "DO"
+    assert matcher.match(normalize("K O O R Remaja")) == "KOORREMAJA"
+    assert matcher.match(normalize("Be. 5")) == "BE."
+    assert matcher.match(normalize("BEx")) == "BE"
+    assert matcher.search(normalize("lagu BNSM 4")) == "BNSM"
+
+
+def test_case_and_whitespace_variants():
+    matcher = KeywordMatcher(["PENGAKUAN IMAN"])
+    for text in ("PENGAKUAN IMAN", "pengakuan iman", "Pengakuan  Iman", "P E N G A K U A N IMAN"):
+        assert matcher.match(normalize(text)) == "PENGAKUANIMAN"
+    assert matcher.match(normalize(" pengakuan\timan")) is None
+    assert old_match(["PENGAKUAN IMAN"], normalize(" pengakuan\timan")) is False
+
+
+def test_empty_list_matches_nothing():
+    matcher = KeywordMatcher([])
+    assert matcher.match("APAPUN") is None
+    assert matcher.search("") is None
@@ -0,0 +1,121 @@
+# tests/test_section_cache.py
+#
+# Mengubah satu section hanya merender ulang section itu; sisanya
+# diambil dari cache dan hasilnya sama dengan tanpa cache.
+#
+# Section setelah warta dirender dengan ukuran slide warta; cache section
+# tidak boleh memakai hasil render 4:3 dari deck dengan warta Normal
+# untuk deck dengan warta Wide (atau sebaliknya).
+#
+#   python -m pytest -q tests
+
+import copy
+import os
+import sys
+from io import BytesIO
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "benchmarks"))
+
+from docx import Document  # noqa: E402
+from pptx import Presentation  # noqa: E402
+from pptx.util import Inches  # noqa: E402
+
+import instrumentation  # noqa: E402
+import liturgy_registry  # noqa: E402
+import logic  # noqa: E402
+import parallel_render  # noqa: E402
+import section_cache  # noqa: E402
+import synthetic_docs  # noqa: E402
+from disk_cache import DiskCache  # noqa: E402
+from doc_analysis import analyze  # noqa: E402
+
+FORMATS = ["Ibadah Indonesia Umum", "Ibadah Batak Umum", "Ibadah Sore",
+           "Sekolah Minggu (SKM)"]
+# Profil SKM memaksa 10 x 7.5 inci di setiap generate_slides, jadi deck
+# tetap 4:3 walaupun wartanya Wide (sama seperti tanpa cache)
+FIXED_SIZE = {"Sekolah Minggu (SKM)"}
+
+
+@pytest.fixture
+def fresh_cache(tmp_path, monkeypatch):
+    cache = DiskCache("sections", 100 * 1024 * 1024)
+    cache.dir = str(tmp_path)
+    monkeypatch.setattr(section_cache, "_disk", cache)
+    monkeypatch.setattr(section_cache, "SECTION_CACHE", True)
+    section_cache.clear()
+    yield
+    section_cache.clear()
+
+
+def build(fmt, warta_mode):
+    analysis = analyze(synthetic_docs.make_tata(fmt, sections=12))
+    cover = liturgy_registry.load(fmt, "cover").extract_cover(analysis)
+    isi = liturgy_registry.load(fmt, "isi").extract_isi(analysis)
+    warta = Document(BytesIO(synthetic_docs.make_warta(remaja=warta_mode == "Wide")))
+    cover_info = {"minggu": cover["minggu"], "topik": cover["topik"],
+                  "tanggal": cover["tanggal"], "use_bg": False, "mode": "Projector"}
+    gen_slides = liturgy_registry.load(fmt, "ppt").generate_slides
+    return logic.merge_and_generate(warta, cover_info, isi, gen_slides, warta_mode,
+                                    workers=0, seed=0).getvalue()
+
+
+@pytest.mark.parametrize("fmt", FORMATS)
+def test_wide_warta_after_normal_warta(fmt, fresh_cache, monkeypatch):
+    normal = build(fmt, "Normal")
+    wide = build(fmt, "Wide")
+    # Urutan sebaliknya: deck Normal tidak boleh memakai hasil render Wide
+    normal_again = build(fmt, "Normal")
+
+    monkeypatch.setattr(section_cache, "SECTION_CACHE", False)
+    assert wide == build(fmt, "Wide")
+    assert normal == normal_again == build(fmt, "Normal")
+
+    if fmt in FIXED_SIZE:
+        return
+    prs = Presentation(BytesIO(wide))
+    assert prs.slide_width == Inches(13.33)
+    # Textbox section setelah warta mengikuti lebar 16:9
+    widths = {shape.width for shape in prs.slides[len(prs.slides) - 1].shapes
+              if shape.has_text_frame}
+    assert max(widths) > Inches(10)
+
+
+@pytest.mark.parametrize("workers", [0, 2])
+def test_edit_one_section_renders_only_that_section(workers, fresh_cache, monkeypatch):
+    fmt = "Ibadah Indonesia Umum"
+    analysis = analyze(synthetic_docs.make_tata(fmt, sections=12))
+    isi = liturgy_registry.load(fmt, "isi").extract_isi(analysis)
+    gen_slides = liturgy_registry.load(fmt, "ppt").generate_slides
+
+    rendered = []
+    render_sections = parallel_render.render_sections
+
+    def record(gen_slides_func, cover_info, sections, *args):
+        rendered.append(list(sections))
+        return render_sections(gen_slides_func, cover_info, sections, *args)
+
+    monkeypatch.setattr(parallel_render, "render_sections", record)
+
+    def deck(data_isi):
+        cover_info = {"minggu": "", "topik": "", "tanggal": "", "use_bg": False,
+                      "mode": "Projector"}
+        with instrumentation.trace("test") as t:
+            data = logic.merge_and_generate(None, cover_info, data_isi, gen_slides,
+                                            "Normal", workers=workers, seed=0).getvalue()
+        return data, t.counters.get("section_cache_hits", 0)
+
+    deck(isi)
+    assert len(rendered[-1]) == len(isi)
+
+    edited = copy.deepcopy(isi)
+    edited[3]["isi"][0] = "Baris yang baru diubah"
+    data, hits = deck(edited)
+    assert rendered[-1] == [edited[3]]
+    assert hits == len(isi) - 1
+
+    monkeypatch.setattr(section_cache, "SECTION_CACHE", False)
+    assert data == deck(edited)[0]